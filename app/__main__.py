@@ -3,46 +3,66 @@
 
 import sys
 import os
+import importlib.util
 
-os.environ.setdefault("QT_OPENGL", "software")
-os.environ.setdefault("QT_ENABLE_HIGHDPI_SCALING", "1")
+from PySide6.QtCore import QCoreApplication, Qt
+from PySide6.QtWidgets import QApplication, QSplashScreen
 
-try:
-    from PySide6.QtCore import QCoreApplication, Qt
-    QCoreApplication.setAttribute(Qt.AA_UseSoftwareOpenGL, True)
-except Exception:
-    pass
 
-from PySide6.QtWidgets import QApplication
+def _init_qt_env():
+    """QApplication 生成前に必要な環境変数と Qt 属性を設定"""
+    if QCoreApplication.instance() is not None:
+        # 既にアプリケーションがある（埋め込み・再起動時）なら設定しても効かない
+        return
 
-try:
-    QApplication.setHighDpiScaleFactorRoundingPolicy(
-        Qt.HighDpiScaleFactorRoundingPolicy.PassThrough
-    )
-except Exception:
-    pass
+    os.environ.setdefault("QT_OPENGL", "software")
+    os.environ.setdefault("QT_ENABLE_HIGHDPI_SCALING", "1")
 
-from app.hub.hub_window import HubWindow
+    try:
+        QCoreApplication.setAttribute(Qt.AA_UseSoftwareOpenGL, True)
+    except Exception:
+        pass
+
+    try:
+        QApplication.setHighDpiScaleFactorRoundingPolicy(
+            Qt.HighDpiScaleFactorRoundingPolicy.PassThrough
+        )
+    except Exception:
+        pass
 
 
 def main():
+    _init_qt_env()
     app = QApplication(sys.argv)
     app.setStyle("Fusion")
 
+    # 重い import の間も起動中であることが分かるようスプラッシュを先に表示
+    from PySide6.QtGui import QPixmap, QColor
+    pix = QPixmap(360, 120)
+    pix.fill(QColor("#141a3a"))
+    splash = QSplashScreen(pix)
+    splash.showMessage("Contour Quest を起動中…", Qt.AlignCenter, QColor("#e9edff"))
+    splash.show()
+    app.processEvents()
+
+    # HubWindow の推移的 import（numpy / nibabel 等）は QApplication 生成後に遅延
+    from app.hub.hub_window import HubWindow
+
     hub = HubWindow()
     hub.show()
+    splash.finish(hub)
 
     sys.exit(app.exec())
 
 
 if __name__ == "__main__":
-    try:
-        import nibabel
-        import numpy
-        from scipy.ndimage import binary_dilation
+    # 実 import は使用箇所まで遅延し、ここでは存在確認のみ行う
+    missing = [m for m in ("nibabel", "numpy", "scipy")
+               if importlib.util.find_spec(m) is None]
+    if not missing:
         print("必要なライブラリが確認できました")
         main()
-    except ImportError as e:
-        print(f"必要なライブラリがインストールされていません: {e}")
+    else:
+        print(f"必要なライブラリがインストールされていません: {', '.join(missing)}")
         print("以下のコマンドでインストールしてください:")
         print("pip install PySide6 nibabel numpy scipy")
@@ -11,6 +11,9 @@ import os
 from typing import Dict, List, Any, Optional
 from pathlib import Path
 
+from .json_cache import load_json_cached, invalidate_json_cache
+from .styles import ROI_PALETTE
+
 
 class ConfigManager:
     """統一設定管理クラス"""
@@ -28,8 +31,7 @@ class ConfigManager:
         if not self.config_path.exists():
             return self._get_default_config()
         try:
-            with open(self.config_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return load_json_cached(self.config_path)
         except Exception:
             return self._get_default_config()
 
@@ -41,19 +43,18 @@ class ConfigManager:
         }
 
     def get_roi_definitions(self, existing_json_path: str = None) -> List[Dict]:
-        from app.common.styles import roi_color
         if existing_json_path and os.path.exists(existing_json_path):
             try:
-                with open(existing_json_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    if 'labels' in data:
-                        return data['labels']
+                data = load_json_cached(existing_json_path)
+                if 'labels' in data:
+                    return data['labels']
             except Exception:
                 pass
         # configに roi_definitions があれば使うが、色はパレットで上書き
         defs = self.config.get('roi_definitions', {}).get('default_rois', [])
+        palette_len = len(ROI_PALETTE)
         for i, d in enumerate(defs):
-            d['color'] = roi_color(i)
+            d['color'] = ROI_PALETTE[i % palette_len]
         return defs
 
     def get_game_settings(self) -> Dict[str, Any]:
@@ -75,7 +76,8 @@ class ConfigManager:
         file_paths = self.config.get('file_paths', {})
         relative_path = file_paths.get(path_key, '.')
         if not os.path.isabs(relative_path):
-            return (self._base_dir / relative_path).resolve()
+            # resolve() はシンボリックリンク解決の syscall を伴うため字句的な正規化に留める
+            return Path(os.path.abspath(self._base_dir / relative_path))
         return Path(relative_path)
 
     def get_ui_settings(self) -> Dict[str, Any]:
@@ -103,6 +105,7 @@ class ConfigManager:
                 json.dump(config, f, ensure_ascii=False, indent=2)
         except Exception as e:
             print(f"設定ファイル保存エラー: {e}")
+        invalidate_json_cache(self.config_path)
 
     def update_setting(self, key_path: str, value: Any):
         keys = key_path.split('.')
@@ -115,14 +118,16 @@ class ConfigManager:
         self.save_config()
 
     def merge_with_existing_json(self, json_path: str, data: Dict) -> Dict:
-        if os.path.exists(json_path):
-            try:
-                with open(json_path, 'r', encoding='utf-8') as f:
-                    existing_data = json.load(f)
-                    data.update(existing_data)
-            except Exception:
-                pass
-        return data
+        """既存JSONの内容で data を上書きした新しい dict を返す（data 自体は変更しない）"""
+        try:
+            if os.path.getsize(json_path) == 0:
+                return data
+            existing_data = load_json_cached(json_path)
+        except Exception:
+            return data
+        if not isinstance(existing_data, dict) or not existing_data:
+            return data
+        return {**data, **existing_data}
 
 
 _config_manager = None
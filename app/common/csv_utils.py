@@ -2,13 +2,27 @@
 """CSV読み書きヘルパー"""
 
 import os
-import csv
 import socket
-from typing import Dict, List
+from functools import lru_cache
+from typing import Dict, Iterable, List
 
 from .paths import get_project_root
 
 
+class _HostTagTable(dict):
+    """str.translate 用: 英数字と -_ 以外を _ に置換（未登録の文字は初回に判定して登録）"""
+
+    def __missing__(self, code: int) -> int:
+        ch = chr(code)
+        out = code if (ch.isalnum() or ch in "-_") else ord("_")
+        self[code] = out
+        return out
+
+
+_HOST_TAG_TABLE = _HostTagTable()
+
+
+@lru_cache(maxsize=1)
 def _host_tag() -> str:
     """ホスト名タグを取得（CQ_NODE_TAG / COMPUTERNAME / HOSTNAME / gethostname()）"""
     tag = (
@@ -21,7 +35,7 @@ def _host_tag() -> str:
             tag = socket.gethostname()
         except Exception:
             tag = "node"
-    tag = "".join(c if (c.isalnum() or c in "-_") else "_" for c in str(tag))
+    tag = str(tag).translate(_HOST_TAG_TABLE)
     tag = tag.strip("_-")
     return tag or "node"
 
@@ -38,23 +52,60 @@ def year_csv_path(year: str) -> str:
     return os.path.join(csv_dir, f"CQ_{year}_{node}.csv")
 
 
-def write_year_csv(year: str, row: dict, fieldnames: List[str] = None):
-    """年度CSVに1行追記"""
+YEAR_CSV_FIELDNAMES = (
+    "timestamp", "year", "group", "team", "participant",
+    "session", "region", "mode", "rois", "ct", "gt_label", "result_dir"
+)
+
+_CSV_BUFFER_SIZE = 64 * 1024
+_UTF8_BOM = "\ufeff"
+_CSV_NEEDS_QUOTE = frozenset(',"\r\n')
+
+
+def _csv_escape(val: str) -> str:
+    """csv.QUOTE_MINIMAL 相当のクォート処理"""
+    if _CSV_NEEDS_QUOTE.isdisjoint(val):
+        return val
+    return '"' + val.replace('"', '""') + '"'
+
+
+def _csv_line(values: Iterable[str]) -> str:
+    return ",".join(_csv_escape(v) for v in values) + "\r\n"
+
+
+_YEAR_CSV_HEADER_LINE = _csv_line(YEAR_CSV_FIELDNAMES)
+
+
+def write_year_csv_rows(year: str, rows: Iterable[dict], fieldnames: List[str] = None):
+    """年度CSVに複数行をまとめて追記（open / ヘッダ判定は1回のみ）"""
     if fieldnames is None:
-        fieldnames = [
-            "timestamp", "year", "group", "team", "participant",
-            "session", "region", "mode", "rois", "ct", "gt_label", "result_dir"
-        ]
+        fieldnames = YEAR_CSV_FIELDNAMES
+        header_line = _YEAR_CSV_HEADER_LINE
+    else:
+        header_line = _csv_line(fieldnames)
 
     path = year_csv_path(year)
-    exists_and_nonempty = os.path.exists(path) and os.path.getsize(path) > 0
+    try:
+        exists_and_nonempty = os.stat(path).st_size > 0
+    except FileNotFoundError:
+        exists_and_nonempty = False
 
-    with open(path, "a", newline="", encoding="utf-8-sig") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
-        if not exists_and_nonempty:
-            writer.writeheader()
-        sanitized = {}
+    # BOM は新規/空ファイルの先頭だけに付ける（utf-8-sig での追記・書き戻しと同じバイト列になる）
+    lines = []
+    if not exists_and_nonempty:
+        lines.append(_UTF8_BOM + header_line)
+    for row in rows:
+        values = []
         for k in fieldnames:
             val = row.get(k, "")
-            sanitized[k] = "" if val is None else str(val)
-        writer.writerow(sanitized)
+            values.append("" if val is None else str(val))
+        lines.append(_csv_line(values))
+
+    # テキスト層を通さず、エンコード済みバイト列を一括で追記
+    with open(path, "ab", buffering=_CSV_BUFFER_SIZE) as f:
+        f.write("".join(lines).encode("utf-8"))
+
+
+def write_year_csv(year: str, row: dict, fieldnames: List[str] = None):
+    """年度CSVに1行追記"""
+    write_year_csv_rows(year, (row,), fieldnames)
@@ -5,7 +5,7 @@ from dataclasses import dataclass, field
 from typing import Optional, List, Dict
 
 
-@dataclass
+@dataclass(slots=True)
 class GameConfig:
     """コンツーリングゲームの設定"""
     enabled: bool = False
@@ -21,7 +21,7 @@ class GameConfig:
     gt_edit_mode: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class ScoreResult:
     """ROI単位のスコア結果"""
     roi_name: str
@@ -32,7 +32,7 @@ class ScoreResult:
     details: Dict
 
 
-@dataclass
+@dataclass(slots=True)
 class GameResult:
     """ゲーム全体の結果"""
     participant: str
@@ -46,7 +46,7 @@ class GameResult:
     overall_score: float
 
 
-@dataclass
+@dataclass(slots=True)
 class ParticipantResult:
     """参加者の結果データ（複数モード/複数ファイル対応）"""
     participant: str
@@ -59,7 +59,7 @@ class ParticipantResult:
     labels: List[Dict]
 
 
-@dataclass
+@dataclass(slots=True)
 class GroupData:
     """グループ（班）の全データ"""
     team: str
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""JSON ファイル内容のキャッシュ（mtime / サイズで無効化）"""
+
+import json
+import os
+from typing import Any, Dict, Tuple
+
+try:
+    import orjson as _orjson
+except Exception:
+    _orjson = None
+
+# path -> (st_mtime_ns, st_size, raw bytes)
+_RAW_CACHE: Dict[str, Tuple[int, int, bytes]] = {}
+
+
+def _fast_json_loads(raw: bytes) -> Any:
+    """orjson があればそれでパースし、無ければ（または NaN 等で失敗すれば）json を使う"""
+    if _orjson is not None:
+        try:
+            return _orjson.loads(raw)
+        except _orjson.JSONDecodeError:
+            pass
+    return json.loads(raw.decode("utf-8"))
+
+
+def load_json_cached(path: str) -> Any:
+    """JSON を読み込む。ファイルが未変更ならファイルは読まず、キャッシュ済みのバイト列をパースする
+
+    呼び出し側は毎回新しいオブジェクトを受け取るので、自由に変更してよい。
+    ファイルが存在しない場合は FileNotFoundError、パース失敗時は
+    ValueError など json.load と同じ例外を送出する。
+    """
+    key = os.fspath(path)
+    st = os.stat(key)
+    cached = _RAW_CACHE.get(key)
+    if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return _fast_json_loads(cached[2])
+
+    with open(key, "rb") as f:
+        raw = f.read()
+    data = _fast_json_loads(raw)
+    _RAW_CACHE[key] = (st.st_mtime_ns, st.st_size, raw)
+    return data
+
+
+def invalidate_json_cache(path: str):
+    """指定パスのキャッシュを破棄（書き込み後に呼ぶ）"""
+    _RAW_CACHE.pop(os.fspath(path), None)
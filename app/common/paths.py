@@ -2,20 +2,24 @@
 """パス解決ユーティリティ"""
 
 import os
+from functools import lru_cache
 from pathlib import Path
 
 
+@lru_cache(maxsize=1)
 def get_project_root() -> str:
     """プロジェクトルート（app/ の親ディレクトリ）を返す"""
     app_dir = os.path.dirname(os.path.abspath(__file__))  # common/
     return os.path.abspath(os.path.join(app_dir, os.pardir, os.pardir))
 
 
+@lru_cache(maxsize=1)
 def get_app_dir() -> str:
     """app/ ディレクトリの絶対パスを返す"""
     return os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
 
 
+@lru_cache(maxsize=1)
 def get_settings_file() -> str:
     """contour_quest_config.json の絶対パスを返す"""
     app_dir = get_app_dir()
@@ -39,11 +43,8 @@ def resolve_path(p: str) -> str:
     if os.path.isabs(p) and os.path.exists(p):
         return os.path.abspath(p)
 
-    app_dir = get_app_dir()
-    root_dir = get_project_root()
-    settings_dir = os.path.dirname(get_settings_file())
-    bases = [os.getcwd(), app_dir, root_dir, settings_dir]
-    for base in bases:
+    # cwd は実行中に変わり得るため毎回取得し、それ以外は固定の候補を使う
+    for base in (os.getcwd(),) + _static_bases():
         try:
             cand = os.path.abspath(os.path.join(base, p))
             if os.path.exists(cand):
@@ -54,6 +55,12 @@ def resolve_path(p: str) -> str:
     return os.path.abspath(p)
 
 
+@lru_cache(maxsize=1)
+def _static_bases() -> tuple:
+    """resolve_path の探索基準のうち実行中に変わらないもの"""
+    return (get_app_dir(), get_project_root(), os.path.dirname(get_settings_file()))
+
+
 def make_relative_path(absolute_path: str) -> str:
     """絶対パスをプロジェクトルートからの相対パスに変換"""
     if not absolute_path:
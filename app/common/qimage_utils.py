@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+"""numpy 配列から QImage を作るヘルパー"""
+
+import numpy as np
+
+from PySide6.QtGui import QColor, QImage
+
+
+def create_colored_mask_qimage(mask: np.ndarray, color_rgba) -> QImage:
+    """マスクの色付きQImageを作成"""
+    h, w = mask.shape
+    # 透明/指定色の2色カラーテーブルを持つ Indexed8 にし、マスクは1画素1バイトのまま渡す
+    if mask.dtype == np.bool_ and mask.flags.c_contiguous:
+        index = mask.view(np.uint8)
+    else:
+        index = np.ascontiguousarray(mask != 0).view(np.uint8)
+    r, g, b, a = (int(c) for c in color_rgba)
+    qimg = QImage(index.data, w, h, w, QImage.Format_Indexed8)
+    qimg.setColorTable([0, QColor(r, g, b, a).rgba()])
+    qimg.ndarray = index
+    return qimg
@@ -3,10 +3,13 @@
 
 import os
 import json
+import shutil
+import tempfile
 import datetime as _dt
 from typing import Dict, Any
 
 from .paths import get_settings_file, resolve_path
+from .json_cache import load_json_cached, invalidate_json_cache
 
 
 def fiscal_year_default() -> int:
@@ -15,6 +18,17 @@ def fiscal_year_default() -> int:
     return now.year if now.month >= 4 else now.year - 1
 
 
+def _make_region(rois: str, time_min: int, ct: str, gt_label: str, outdir: str) -> Dict[str, Any]:
+    """部位セット1件分のデフォルト辞書を生成"""
+    return {
+        "rois": rois,
+        "time_min": time_min,
+        "ct": ct,
+        "gt_label": gt_label,
+        "outdir": outdir,
+    }
+
+
 def load_settings() -> Dict[str, Any]:
     """統一設定ファイル contour_quest_config.json を読み込む"""
     cfg_path = get_settings_file()
@@ -22,8 +36,7 @@ def load_settings() -> Dict[str, Any]:
     data: Dict[str, Any] = {}
     if os.path.exists(cfg_path):
         try:
-            with open(cfg_path, "r", encoding="utf-8") as f:
-                data = json.load(f) or {}
+            data = load_json_cached(cfg_path) or {}
         except Exception:
             data = {}
 
@@ -57,37 +70,20 @@ def load_settings() -> Dict[str, Any]:
                     return p
             return ""
 
-        ct_rel = _first_exist(
-            os.path.join(nifti_dir, "abdominal_ct.nii.gz"),
-            os.path.join("nifti", "abdominal_ct.nii.gz")
-        )
-        gt_rel = _first_exist(
-            os.path.join(nifti_dir, "abdominal_label.nii.gz"),
-            os.path.join("nifti", "abdominal_label.nii.gz")
-        )
+        # nifti_dir 自体が無ければその配下の存在確認は省く
+        nifti_dirs = [nifti_dir] if os.path.isdir(nifti_dir) else []
+        nifti_dirs.append("nifti")
+        ct_rel = _first_exist(*(os.path.join(d, "abdominal_ct.nii.gz") for d in nifti_dirs))
+        gt_rel = _first_exist(*(os.path.join(d, "abdominal_label.nii.gz") for d in nifti_dirs))
+
+        ct = ct_rel or "nifti/abdominal_ct.nii.gz"
+        gt_label = gt_rel or "nifti/abdominal_label.nii.gz"
+        outdir = file_paths.get("records_dir", "./records") or "./records"
 
         data["regions"] = {
-            "腹部1": {
-                "rois": "右腎,胃,胆嚢",
-                "time_min": 15,
-                "ct": ct_rel if ct_rel else "nifti/abdominal_ct.nii.gz",
-                "gt_label": gt_rel if gt_rel else "nifti/abdominal_label.nii.gz",
-                "outdir": file_paths.get("records_dir", "./records") or "./records",
-            },
-            "腹部2": {
-                "rois": "左腎,脾臓,膀胱",
-                "time_min": 15,
-                "ct": ct_rel if ct_rel else "nifti/abdominal_ct.nii.gz",
-                "gt_label": gt_rel if gt_rel else "nifti/abdominal_label.nii.gz",
-                "outdir": file_paths.get("records_dir", "./records") or "./records",
-            },
-            "腹部3": {
-                "rois": "肝臓,膵臓",
-                "time_min": 20,
-                "ct": ct_rel if ct_rel else "nifti/abdominal_ct.nii.gz",
-                "gt_label": gt_rel if gt_rel else "nifti/abdominal_label.nii.gz",
-                "outdir": file_paths.get("records_dir", "./records") or "./records",
-            }
+            "腹部1": _make_region("右腎,胃,胆嚢", 15, ct, gt_label, outdir),
+            "腹部2": _make_region("左腎,脾臓,膀胱", 15, ct, gt_label, outdir),
+            "腹部3": _make_region("肝臓,膵臓", 20, ct, gt_label, outdir),
         }
 
     return data
@@ -100,8 +96,7 @@ def save_settings(data: Dict[str, Any]):
     base: Dict[str, Any] = {}
     if os.path.exists(cfg_path):
         try:
-            with open(cfg_path, "r", encoding="utf-8") as f:
-                base = json.load(f) or {}
+            base = load_json_cached(cfg_path) or {}
         except Exception:
             base = {}
 
@@ -109,8 +104,34 @@ def save_settings(data: Dict[str, Any]):
         if k in data:
             base[k] = data[k]
 
+    new_text = json.dumps(base, ensure_ascii=False, indent=2)
+
+    # 内容が変わらなければ書き込まない
     try:
-        with open(cfg_path, "w", encoding="utf-8") as f:
-            json.dump(base, f, ensure_ascii=False, indent=2)
+        with open(cfg_path, "r", encoding="utf-8") as f:
+            if f.read() == new_text:
+                return
+    except Exception:
+        pass
+
+    # 同じディレクトリの一時ファイルに書いてから置換（書き込み途中で壊れないように）
+    tmp_path = None
+    try:
+        fd, tmp_path = tempfile.mkstemp(
+            prefix=".contour_quest_config.", suffix=".tmp", dir=os.path.dirname(cfg_path)
+        )
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(new_text)
+        if os.path.exists(cfg_path):
+            shutil.copymode(cfg_path, tmp_path)
+        os.replace(tmp_path, cfg_path)
+        tmp_path = None
     except Exception as e:
         print(f"設定保存エラー: {e}")
+    finally:
+        if tmp_path is not None:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+    invalidate_json_cache(cfg_path)
@@ -1,8 +1,9 @@
 # -*- coding: utf-8 -*-
 """テーマ定数、共通スタイルシート"""
 
-import hashlib
+import zlib
 import colorsys
+from functools import lru_cache
 
 # ------------------------------------
 # カラー定数
@@ -30,6 +31,13 @@ CARD_STYLE_HOVER = (
     "border-radius: 18px;"
 )
 
+
+@lru_cache(maxsize=None)
+def card_style_hover(accent: str) -> str:
+    """CARD_STYLE_HOVER にアクセント色を埋め込んだ文字列（アクセント毎にキャッシュ）"""
+    return CARD_STYLE_HOVER.format(accent=accent)
+
+
 # ------------------------------------
 # 入力コントロール
 # ------------------------------------
@@ -71,7 +79,7 @@ SCORE_COLOR_POOR = "#e74c3c"
 # ------------------------------------
 # ROI 固定カラーパレット（順番で自動割り当て）
 # ------------------------------------
-ROI_PALETTE = [
+ROI_PALETTE = (
     "#e6194b",  # 赤
     "#3cb44b",  # 緑
     "#0082c8",  # 青
@@ -92,12 +100,13 @@ ROI_PALETTE = [
     "#000080",  # ネイビー
     "#1f77b4",  # スチールブルー
     "#ff7f0e",  # ダークオレンジ
-]
+)
+_ROI_PALETTE_LEN = len(ROI_PALETTE)
 
 
 def roi_color(index: int) -> str:
     """インデックスからROI色を返す（パレットを巡回）"""
-    return ROI_PALETTE[index % len(ROI_PALETTE)]
+    return ROI_PALETTE[index % _ROI_PALETTE_LEN]
 
 
 # ------------------------------------
@@ -452,17 +461,35 @@ QFrame {{
 # ------------------------------------
 # ヘルパー関数
 # ------------------------------------
+@lru_cache(maxsize=256)
 def accent_from_text(text: str) -> str:
     """テキストから安定したアクセント色(#RRGGBB)を生成（HSL色相ハッシュ）"""
     if not text:
         return PRIMARY_ACCENT
-    h = int(hashlib.sha1(text.encode("utf-8")).hexdigest()[:6], 16) % 360
+    h = zlib.crc32(text.encode("utf-8")) % 360
     return hsl_to_hex(h, 0.70, 0.55)
 
 
 def hsl_to_hex(h: float, s: float, l: float) -> str:
-    r, g, b = colorsys.hls_to_rgb(h / 360.0, l, s)
-    return "#{:02X}{:02X}{:02X}".format(int(r * 255), int(g * 255), int(b * 255))
+    # colorsys.hls_to_rgb を使わず色相の6区間で直接計算
+    c = (1.0 - abs(2.0 * l - 1.0)) * s
+    hp = (h % 360) / 60.0
+    x = c * (1.0 - abs(hp % 2.0 - 1.0))
+    m = l - c / 2.0
+    sector = int(hp)
+    if sector == 0:
+        r, g, b = c, x, 0.0
+    elif sector == 1:
+        r, g, b = x, c, 0.0
+    elif sector == 2:
+        r, g, b = 0.0, c, x
+    elif sector == 3:
+        r, g, b = 0.0, x, c
+    elif sector == 4:
+        r, g, b = x, 0.0, c
+    else:
+        r, g, b = c, 0.0, x
+    return "#{:02X}{:02X}{:02X}".format(int((r + m) * 255), int((g + m) * 255), int((b + m) * 255))
 
 
 def hex_to_rgb(hex_color: str) -> tuple:
@@ -480,8 +507,9 @@ def shade(hex_color: str, delta_l: float) -> str:
     return "#{:02X}{:02X}{:02X}".format(int(r2 * 255), int(g2 * 255), int(b2 * 255))
 
 
+@lru_cache(maxsize=None)
 def btn_style(*, primary=False, secondary=False, outline=False, big=False) -> str:
-    """共通ボタンスタイルシート生成"""
+    """共通ボタンスタイルシート生成（引数の組み合わせ毎にキャッシュ）"""
     radius = 18 if not big else 22
     pad_y = 12 if not big else 16
     pad_x = 18 if not big else 26
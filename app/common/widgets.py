@@ -1,13 +1,15 @@
 # -*- coding: utf-8 -*-
 """ゲーム風共通ウィジェット: GameCard, FunButton, SpringButton"""
 
+import math
 import time
+from functools import lru_cache
 
-from PySide6.QtCore import Qt, QPropertyAnimation, QEasingCurve, QTimer, Signal, Property
-from PySide6.QtGui import QPainter, QColor
+from PySide6.QtCore import Qt, QEvent, QRectF, QTimer, QVariantAnimation, Signal, Property
+from PySide6.QtGui import QPainter, QColor, QPixmap
 from PySide6.QtWidgets import (
     QPushButton, QFrame, QVBoxLayout, QLabel, QSizePolicy,
-    QGraphicsDropShadowEffect, QGraphicsOpacityEffect,
+    QGraphicsDropShadowEffect,
     QStyleOptionButton, QStyle,
 )
 
@@ -16,45 +18,101 @@ try:
 except Exception:
     _sbk = None
 
-from .styles import btn_style, PRIMARY_ACCENT
+# C++ 側が破棄済みのラッパを判定（shiboken6 が無ければ常に有効とみなす）
+_isvalid = _sbk.isValid if _sbk is not None else (lambda _obj: True)
+
+from .styles import btn_style, card_style_hover, CARD_STYLE_NORMAL, PRIMARY_ACCENT
+
+# 影の色は全インスタンスで共有する（ウィジェット毎に QColor を作らない）
+_CARD_SHADOW_COLOR = QColor(0, 0, 0, 80)
+_BUTTON_SHADOW_COLOR = QColor(0, 0, 0)
+_SPRING_SHADOW_COLOR = QColor(0, 0, 0, 120)
+
+
+def _attach_drop_shadow(widget, color: QColor, blur: float, dx: float, dy: float) -> QGraphicsDropShadowEffect:
+    """共通設定のドロップシャドウを生成してウィジェットに設定"""
+    effect = QGraphicsDropShadowEffect(widget)
+    effect.setColor(color)
+    effect.setBlurRadius(blur)
+    effect.setOffset(dx, dy)
+    widget.setGraphicsEffect(effect)
+    return effect
+
+
+class _ShadowDriver:
+    """全ウィジェットの影のぼかし半径アニメーションを1本のタイマーでまとめて駆動"""
+
+    INTERVAL_MS = 16
+    DURATION_SEC = 0.14
+
+    def __init__(self):
+        self._timer = None
+        # id(effect) -> (effect, 開始値, 終了値, 開始時刻)
+        self._entries = {}
+
+    def animate(self, effect: QGraphicsDropShadowEffect, blur: float):
+        self._entries[id(effect)] = (effect, effect.blurRadius(), float(blur), time.monotonic())
+        if self._timer is None:
+            # QApplication 生成後の初回利用時に作成する
+            self._timer = QTimer()
+            self._timer.setInterval(self.INTERVAL_MS)
+            self._timer.timeout.connect(self._tick)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def _tick(self):
+        now = time.monotonic()
+        duration = self.DURATION_SEC
+        done = []
+        for key, (effect, start, end, t0) in self._entries.items():
+            if not _isvalid(effect):
+                done.append(key)
+                continue
+            p = min(1.0, (now - t0) / duration)
+            q = 1.0 - (1.0 - p) ** 3  # OutCubic
+            effect.setBlurRadius(start + (end - start) * q)
+            if p >= 1.0:
+                done.append(key)
+        for key in done:
+            del self._entries[key]
+        if not self._entries:
+            self._timer.stop()
+
+
+_shadow_driver = _ShadowDriver()
 
 
 # ---------------------------------------------------------------------------
 # GameCard — ホバーで拡大・グロー、クリックで縮小するカードウィジェット
 # ---------------------------------------------------------------------------
+@lru_cache(maxsize=16)
+def _gamecard_stylesheet(accent: str) -> str:
+    """アクセント色ごとの GameCard スタイルシート（同一文字列を共有する）"""
+    return (
+        "GameCard {" + CARD_STYLE_NORMAL + "}"
+        'GameCard[hover="true"] {' + card_style_hover(accent) + "}"
+    )
+
+
 class GameCard(QFrame):
     """ホバーで拡大・グロー、クリックで縮小するカードウィジェット"""
     clicked = Signal()
 
     def __init__(self, icon_text: str = "", title: str = "", description: str = "",
-                 accent: str = PRIMARY_ACCENT, parent=None):
+                 accent: str = PRIMARY_ACCENT, shadow: bool = True, parent=None):
         super().__init__(parent)
         self._accent = accent
         self.setCursor(Qt.PointingHandCursor)
         self.setFixedSize(200, 180)
 
-        self._base_style = (
-            "GameCard {"
-            "  background: rgba(255,255,255,0.04);"
-            "  border: 1px solid rgba(255,255,255,0.10);"
-            "  border-radius: 18px;"
-            "}"
-        )
-        self._hover_style = (
-            "GameCard {"
-            f"  background: rgba(255,255,255,0.07);"
-            f"  border: 2px solid {accent};"
-            "  border-radius: 18px;"
-            "}"
-        )
-        self.setStyleSheet(self._base_style)
+        # ホバー時は動的プロパティで切り替え、スタイルシートは一度だけ設定する
+        self.setProperty("hover", False)
+        self.setStyleSheet(_gamecard_stylesheet(accent))
 
-        # shadow
-        self._shadow = QGraphicsDropShadowEffect(self)
-        self._shadow.setColor(QColor(0, 0, 0, 80))
-        self._shadow.setOffset(0, 4)
-        self._shadow.setBlurRadius(16)
-        self.setGraphicsEffect(self._shadow)
+        # shadow（エフェクトはウィジェット全体をオフスクリーン合成するため省略可能）
+        self._shadow = None
+        if shadow:
+            self._shadow = _attach_drop_shadow(self, _CARD_SHADOW_COLOR, 16, 0, 4)
 
         # layout
         lay = QVBoxLayout(self)
@@ -90,14 +148,14 @@ class GameCard(QFrame):
     # --- events ---
     def enterEvent(self, event):
         self._hovered = True
-        self.setStyleSheet(self._hover_style)
+        self._set_hover_style(True)
         self._animate_shadow(blur=24, offset=6)
         super().enterEvent(event)
 
     def leaveEvent(self, event):
         self._hovered = False
         self._pressed = False
-        self.setStyleSheet(self._base_style)
+        self._set_hover_style(False)
         self._animate_shadow(blur=16, offset=4)
         super().leaveEvent(event)
 
@@ -116,18 +174,17 @@ class GameCard(QFrame):
                 self.clicked.emit()
         super().mouseReleaseEvent(event)
 
+    def _set_hover_style(self, hovered: bool):
+        self.setProperty("hover", hovered)
+        style = self.style()
+        style.unpolish(self)
+        style.polish(self)
+
     def _animate_shadow(self, blur: int, offset: int):
-        try:
-            anim = QPropertyAnimation(self._shadow, b"blurRadius", self)
-            anim.setDuration(140)
-            anim.setStartValue(self._shadow.blurRadius())
-            anim.setEndValue(blur)
-            anim.setEasingCurve(QEasingCurve.OutCubic)
-            anim.start()
-            self._shadow_anim = anim
-            self._shadow.setOffset(0, offset)
-        except Exception:
-            pass
+        if self._shadow is None or not _isvalid(self._shadow):
+            return
+        _shadow_driver.animate(self._shadow, blur)
+        self._shadow.setOffset(0, offset)
 
 
 # ---------------------------------------------------------------------------
@@ -135,19 +192,20 @@ class GameCard(QFrame):
 # ---------------------------------------------------------------------------
 class FunButton(QPushButton):
     def __init__(self, text: str = "", *, big=False, primary=False,
-                 secondary=False, outline=False, parent=None):
+                 secondary=False, outline=False, style: str = None, shadow: bool = True,
+                 parent=None):
         super().__init__(text, parent)
         self._big = big
 
-        self._effect = QGraphicsDropShadowEffect(self)
-        self._effect.setColor(Qt.black)
-        self._effect.setOffset(0, 8)
-        self._effect.setBlurRadius(26 if big else 18)
-        self.setGraphicsEffect(self._effect)
+        self._effect = None
+        if shadow:
+            self._effect = _attach_drop_shadow(self, _BUTTON_SHADOW_COLOR, 26 if big else 18, 0, 8)
 
         self.setCursor(Qt.PointingHandCursor)
-        self.setStyleSheet(btn_style(primary=primary, secondary=secondary,
-                                     outline=outline, big=big))
+        # style 指定時は btn_style を設定してから上書きする二重パースを避ける
+        if style is None:
+            style = btn_style(primary=primary, secondary=secondary, outline=outline, big=big)
+        self.setStyleSheet(style)
 
         if big:
             self.setFixedHeight(66)
@@ -161,39 +219,39 @@ class FunButton(QPushButton):
         self.setSizePolicy(QSizePolicy.Preferred, QSizePolicy.Fixed)
 
     def enterEvent(self, e):
-        try:
-            self._animate_shadow(to_blur=(32 if self._big else 24), to_offset=(0, 6))
-        except Exception:
-            pass
+        self._animate_shadow(to_blur=(32 if self._big else 24), to_offset=(0, 6))
         return super().enterEvent(e)
 
     def leaveEvent(self, e):
-        try:
-            self._animate_shadow(to_blur=(26 if self._big else 18), to_offset=(0, 8))
-        except Exception:
-            pass
+        self._animate_shadow(to_blur=(26 if self._big else 18), to_offset=(0, 8))
         return super().leaveEvent(e)
 
     def _animate_shadow(self, *, to_blur: int, to_offset):
-        try:
-            anim = QPropertyAnimation(self._effect, b"blurRadius", self)
-            anim.setDuration(140)
-            anim.setStartValue(self._effect.blurRadius())
-            anim.setEndValue(to_blur)
-            anim.setEasingCurve(QEasingCurve.OutCubic)
-            anim.start()
-            self._shadow_anim = anim
-            if isinstance(to_offset, tuple):
-                self._effect.setOffset(*to_offset)
-            else:
-                self._effect.setOffset(to_offset)
-        except Exception:
-            pass
+        if self._effect is None or not _isvalid(self._effect):
+            return
+        _shadow_driver.animate(self._effect, to_blur)
+        if isinstance(to_offset, tuple):
+            self._effect.setOffset(*to_offset)
+        else:
+            self._effect.setOffset(to_offset)
 
 
 # ---------------------------------------------------------------------------
 # SpringButton — 物理スプリングで scale を更新するボタン
 # ---------------------------------------------------------------------------
+class _SpringTimeline(QVariantAnimation):
+    """経過時間 [s] を valueChanged シグナルを介さず直接ボタンへ渡すアニメーション"""
+
+    def __init__(self, button: "SpringButton"):
+        super().__init__(button)
+        self._button = button
+
+    def updateCurrentValue(self, value):
+        # setEndValue 等による停止中の値再計算は無視する
+        if self.state() == QVariantAnimation.Running:
+            self._button._on_spring_time(value)
+
+
 class SpringButton(QPushButton):
     PRESS_SCALE = 0.94
     HOVER_SCALE = 1.00
@@ -202,12 +260,13 @@ class SpringButton(QPushButton):
     STIFFNESS = 180.0
     DAMPING = 16.0
     RELEASE_BOOST_V = 4.0
-    FPS = 120
     MIN_SCALE = 0.88
     MAX_SCALE = 0.999
     SHADOW_BLUR = 32
     SHADOW_BASE_OFFSET = 8
     SHADOW_MIN_OFFSET = 2
+    SETTLE_EPS = 1e-3
+    MAX_SETTLE_SEC = 2.0
 
     scaleChanged = Signal(float)
 
@@ -227,13 +286,29 @@ class SpringButton(QPushButton):
         self._target = 1.0
         self._vel = 0.0
         self._shadow = None
+        self._last_off = -1
         self._suspend_shadow = False
         self._create_shadow()
-        self._timer = QTimer(self)
-        self._timer.timeout.connect(self._step_physics)
-        self._timer.setInterval(int(1000 / self.FPS))
-        self._last_t = time.perf_counter()
-        self.scaleChanged.connect(self.update)
+        # 物理定数から決まる固有角振動数・減衰率・減衰固有角振動数は一度だけ計算
+        k, c, m = float(self.STIFFNESS), float(self.DAMPING), float(self.MASS)
+        self._omega = math.sqrt(k / m)
+        zeta = c / (2.0 * math.sqrt(k * m))
+        if zeta < 1.0:
+            self._sigma = zeta * self._omega
+            self._wd = self._omega * math.sqrt(1.0 - zeta * zeta)
+        else:
+            # 過減衰は臨界減衰として扱う（UI 用途では差は見えない）
+            self._sigma = self._omega
+            self._wd = 0.0
+        # (target, A, B): 目標からの偏差の閉形式解の係数
+        self._spring = (1.0, 0.0, 0.0)
+        self._spring_anim = _SpringTimeline(self)
+        self._spring_anim.setStartValue(0.0)
+        self._spring_anim.finished.connect(self._on_spring_settled)
+        # スタイル描画済みボタンのキャッシュ（スプリング中は拡縮して貼るだけ）
+        self._btn_cache = None
+        self._btn_cache_key = None
+        self._last_paint_scale = self._scale
 
     def _shadow_valid(self) -> bool:
         if self._shadow is None:
@@ -249,11 +324,9 @@ class SpringButton(QPushButton):
     def _create_shadow(self):
         if self._suspend_shadow:
             return
-        self._shadow = QGraphicsDropShadowEffect(self)
-        self._shadow.setBlurRadius(self.SHADOW_BLUR)
-        self._shadow.setColor(QColor(0, 0, 0, 120))
-        self._shadow.setOffset(self.SHADOW_BASE_OFFSET, self.SHADOW_BASE_OFFSET)
-        self.setGraphicsEffect(self._shadow)
+        self._shadow = _attach_drop_shadow(self, _SPRING_SHADOW_COLOR, self.SHADOW_BLUR,
+                                           self.SHADOW_BASE_OFFSET, self.SHADOW_BASE_OFFSET)
+        self._last_off = self.SHADOW_BASE_OFFSET
 
     def _ensure_shadow(self):
         if self._suspend_shadow:
@@ -265,12 +338,17 @@ class SpringButton(QPushButton):
         if self._suspend_shadow:
             return
         self._ensure_shadow()
-        t = (self._scale - self.PRESS_SCALE) / (self.REST_SCALE - self.PRESS_SCALE + 1e-6)
-        t = max(0.0, min(1.0, t))
-        off = self.SHADOW_MIN_OFFSET + (self.SHADOW_BASE_OFFSET - self.SHADOW_MIN_OFFSET) * t
+        if not self._shadow_valid():
+            return
         try:
-            if self._shadow_valid():
-                self._shadow.setOffset(off, off)
+            t = (self._scale - self.PRESS_SCALE) / (self.REST_SCALE - self.PRESS_SCALE + 1e-6)
+            t = max(0.0, min(1.0, t))
+            off = self.SHADOW_MIN_OFFSET + (self.SHADOW_BASE_OFFSET - self.SHADOW_MIN_OFFSET) * t
+            off_i = int(off + 0.5)
+            if off_i == self._last_off:
+                return
+            self._shadow.setOffset(off_i, off_i)
+            self._last_off = off_i
         except RuntimeError:
             pass
 
@@ -280,38 +358,79 @@ class SpringButton(QPushButton):
 
     @scale.setter
     def scale(self, v: float):
-        v = max(self.MIN_SCALE, min(self.MAX_SCALE, float(v)))
-        if v != self._scale:
-            self._scale = v
-            self._apply_shadow()
-            self.scaleChanged.emit(v)
-
-    def _ensure_running(self):
-        if not self._timer.isActive():
-            self._last_t = time.perf_counter()
-            self._timer.start()
-
-    def _step_physics(self):
-        now = time.perf_counter()
-        dt = max(1.0 / self.FPS, min(0.050, now - self._last_t))
-        self._last_t = now
-        x = self._scale
-        v = self._vel
-        a = (-self.STIFFNESS * (x - self._target) - self.DAMPING * v) / self.MASS
-        v += a * dt
-        x += v * dt
+        v = float(v)
+        lo, hi = self.MIN_SCALE, self.MAX_SCALE
+        v = lo if v < lo else (hi if v > hi else v)
+        # クランプ後の値が実質同じなら通知しない
+        if -1e-6 < v - self._scale < 1e-6:
+            return
+        self._scale = v
+        self._apply_shadow()
+        # 0.5px 未満の変化は見えないので再描画しない
+        if abs(v - self._last_paint_scale) * max(self.width(), self.height()) > 0.5:
+            self._last_paint_scale = v
+            self.update()
+        self.scaleChanged.emit(v)
+
+    def _spring_state(self, t: float):
+        """時刻 t [s] における (scale, 速度) を減衰振動の閉形式解から求める"""
+        target, a, b = self._spring
+        sigma, wd = self._sigma, self._wd
+        e = math.exp(-sigma * t)
+        if wd:
+            c, s = math.cos(wd * t), math.sin(wd * t)
+            x = e * (a * c + b * s)
+            v = e * ((b * wd - sigma * a) * c - (a * wd + sigma * b) * s)
+        else:
+            x = e * (a + b * t)
+            v = e * (b - sigma * (a + b * t))
+        return target + x, v
+
+    def _start_spring(self, x0: float, v0: float):
+        omega, sigma, wd = self._omega, self._sigma, self._wd
+        target = self._target
+        a = x0 - target
+        if wd:
+            b = (v0 + sigma * a) / wd
+            amp = math.hypot(a, b)
+        else:
+            b = v0 + omega * a
+            amp = abs(a) + abs(b)
+        self._spring = (target, a, b)
+
+        # 振幅（速度は omega 倍）が SETTLE_EPS を下回るまでの時間で打ち切る
+        eps = self.SETTLE_EPS
+        amp = max(amp, amp * omega)
+        if amp <= eps:
+            self._on_spring_settled()
+            return
+        t_end = min(self.MAX_SETTLE_SEC, math.log(amp / eps) / sigma)
+        anim = self._spring_anim
+        anim.setEndValue(t_end)
+        anim.setDuration(max(1, math.ceil(t_end * 1000.0)))
+        anim.start()
+
+    def _on_spring_time(self, t):
+        x, v = self._spring_state(float(t))
         self._vel = v
         self.scale = x
-        if abs(self._scale - self._target) < 1e-3 and abs(self._vel) < 1e-3:
-            self.scale = self._target
-            self._vel = 0.0
-            self._timer.stop()
+
+    def _on_spring_settled(self):
+        self._vel = 0.0
+        self.scale = self._target
+        if self._last_paint_scale != self._scale:
+            self._last_paint_scale = self._scale
+            self.update()
+        self._apply_shadow()
 
     def _to(self, target: float, kick_vel: float = 0.0):
+        if self._spring_anim.state() == QVariantAnimation.Running:
+            x0, v0 = self._spring_state(float(self._spring_anim.currentValue()))
+            self._spring_anim.stop()
+        else:
+            x0, v0 = self._scale, self._vel
         self._target = max(self.MIN_SCALE, min(self.MAX_SCALE, float(target)))
-        if kick_vel:
-            self._vel += kick_vel
-        self._ensure_running()
+        self._start_spring(x0, v0 + kick_vel)
 
     def enterEvent(self, e):
         super().enterEvent(e)
@@ -331,13 +450,40 @@ class SpringButton(QPushButton):
         super().mouseReleaseEvent(e)
         self._to(self.REST_SCALE, kick_vel=self.RELEASE_BOOST_V)
 
+    def _button_pixmap(self) -> QPixmap:
+        opt = QStyleOptionButton()
+        self.initStyleOption(opt)
+        dpr = self.devicePixelRatioF()
+        w, h = self.width(), self.height()
+        key = (w, h, dpr, opt.state, opt.text)
+        if self._btn_cache is None or key != self._btn_cache_key:
+            pix = QPixmap(max(1, round(w * dpr)), max(1, round(h * dpr)))
+            pix.setDevicePixelRatio(dpr)
+            pix.fill(Qt.transparent)
+            painter = QPainter(pix)
+            painter.setRenderHint(QPainter.Antialiasing, True)
+            self.style().drawControl(QStyle.CE_PushButton, opt, painter, self)
+            painter.end()
+            self._btn_cache = pix
+            self._btn_cache_key = key
+        return self._btn_cache
+
+    def resizeEvent(self, e):
+        self._btn_cache = None
+        super().resizeEvent(e)
+
+    def changeEvent(self, e):
+        if e.type() in (QEvent.StyleChange, QEvent.FontChange, QEvent.PaletteChange):
+            self._btn_cache = None
+        super().changeEvent(e)
+
     def paintEvent(self, e):
+        pix = self._button_pixmap()
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing, True)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform, True)
+        # ペインタ変換を使わず、中心基準の拡縮先矩形へ直接描く
         w, h = self.width(), self.height()
-        painter.translate(w / 2.0, h / 2.0)
-        painter.scale(self._scale, self._scale)
-        painter.translate(-w / 2.0, -h / 2.0)
-        opt = QStyleOptionButton()
-        self.initStyleOption(opt)
-        self.style().drawControl(QStyle.CE_PushButton, opt, painter, self)
+        tw, th = w * self._scale, h * self._scale
+        target = QRectF((w - tw) / 2.0, (h - th) / 2.0, tw, th)
+        painter.drawPixmap(target, pix, QRectF(pix.rect()))
@@ -4,8 +4,9 @@ import os
 import json
 import time
 import warnings
-from collections import deque
-from typing import Optional, Dict, Tuple, List
+from collections import deque, OrderedDict
+from functools import lru_cache
+from typing import Any, Optional, Dict, Tuple, List, Callable
 from dataclasses import dataclass
 
 from app.common.paths import make_relative_path
@@ -18,14 +19,17 @@ from PySide6.QtWidgets import (
     QGridLayout, QLabel, QPushButton, QSlider, QLineEdit, QListWidget,
     QRadioButton, QButtonGroup, QFrame, QFileDialog, QMessageBox,
     QGroupBox, QSizePolicy, QTextEdit, QGraphicsView, QGraphicsScene,
-    QGraphicsPixmapItem, QGraphicsEllipseItem, QSplitter, QCheckBox,
-    QDialog, QDialogButtonBox
+    QGraphicsItem, QGraphicsPixmapItem, QGraphicsEllipseItem, QGraphicsLineItem,
+    QSplitter, QCheckBox, QDialog, QDialogButtonBox
+)
+from PySide6.QtCore import (
+    Qt, QTimer, Signal, QThread, QCoreApplication, QRectF, QPointF, QSize, QObject, QEvent,
+    QVariantAnimation, QEasingCurve
 )
-from PySide6.QtCore import Qt, QTimer, Signal, QThread, QCoreApplication, QRectF, QPointF, QSize, QObject, QEvent
 
 from PySide6.QtGui import (
     QFont, QKeyEvent, QTransform, QPainter, QPen, QBrush, QImage, QPixmap,
-    QKeySequence, QShortcut
+    QKeySequence, QShortcut, QRegion, QStaticText, QColor
 )
 
 import numpy as np
@@ -38,7 +42,92 @@ warnings.filterwarnings("ignore", message="Glyph.*missing from current font")
 
 from app.common.config_manager import get_config_manager
 from app.common.data_models import GameConfig
-from app.common.styles import BASE_STYLESHEET, SECONDARY_ACCENT, btn_style
+from app.common.qimage_utils import create_colored_mask_qimage
+from app.common.styles import BASE_STYLESHEET, SECONDARY_ACCENT, ROI_PALETTE, btn_style, roi_color
+
+
+# チュートリアルの誤操作フラグ（ステップごとに OR してビットマスクで持つ）
+FLAG_BRUSH_DRAW = 1
+FLAG_ERASER_MODE = 2
+FLAG_BRUSH_MODE = 4
+FLAG_PAN_MODE = 8
+FLAG_WW_WL_MODE = 16
+
+
+@dataclass(slots=True, frozen=True)
+class TutorialStep:
+    """チュートリアル1ステップ分の定義
+
+    達成判定は通常 trigger=(アプリ属性名, 期待値, 進行フラグ名) で表す。
+    単純な比較で書けないステップだけ check に個別の判定関数を渡す。
+    """
+    title: str
+    detail: str
+    trigger: Optional[Tuple[str, Any, str]] = None
+    check: Optional[Callable[[], bool]] = None
+    wrong_actions: Tuple[str, ...] = ()
+    highlight_target: Optional[str] = None
+
+
+@dataclass(slots=True)
+class TutorialProgress:
+    """現在ステップの達成フラグ（ステップ切替時は丸ごと作り直す）"""
+    brush_drawn: bool = False
+    brush_resized_slider: bool = False
+    eraser_mode_activated: bool = False
+    eraser_drawn: bool = False
+    eraser_resized: bool = False
+    brush_mode_returned: bool = False
+    slice_moved: bool = False
+    drawn_after_slice_move: bool = False
+    shift_erased: bool = False
+    interpolated: bool = False
+    pan_mode_activated: bool = False
+    pan_dragged: bool = False
+    zoomed: bool = False
+    right_drag_resized: bool = False
+    view_reset: bool = False
+    undo_used: bool = False
+    redo_used: bool = False
+    roi_changed: bool = False
+    roi2_drawn: bool = False
+
+
+class _StepNumberLabel(QWidget):
+    """「ステップ n/N」表示。QStaticText でレイアウトを使い回す（変化は最大でもステップ数回）"""
+
+    _COLOR = QColor(255, 255, 255, 200)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        font = self.font()
+        font.setPixelSize(13)
+        self.setFont(font)
+        self.setAttribute(Qt.WA_TranslucentBackground, True)
+        self.setFixedHeight(self.fontMetrics().height())
+        self._static_cache = {}
+        self._current = None
+
+    def set_step(self, step_num, total_steps):
+        key = (step_num, total_steps)
+        static = self._static_cache.get(key)
+        if static is None:
+            static = QStaticText(f"ステップ {step_num}/{total_steps}")
+            static.setTextFormat(Qt.PlainText)
+            static.prepare(QTransform(), self.font())
+            self._static_cache[key] = static
+        if static is not self._current:
+            self._current = static
+            self.update()
+
+    def paintEvent(self, event):
+        if self._current is None:
+            return
+        p = QPainter(self)
+        p.setFont(self.font())
+        p.setPen(self._COLOR)
+        p.drawStaticText(0, 0, self._current)
+        p.end()
 
 
 class TutorialOverlay(QWidget):
@@ -47,6 +136,8 @@ class TutorialOverlay(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setStyleSheet("QWidget { background-color: rgba(0, 0, 0, 0); }")
+        # 透明な外枠は背景を塗る必要がない
+        self.setAttribute(Qt.WA_NoSystemBackground, True)
 
         layout = QVBoxLayout(self)
         layout.setContentsMargins(20, 20, 20, 20)
@@ -54,21 +145,28 @@ class TutorialOverlay(QWidget):
 
         # 指示パネル（デフォルト: 緑色＝操作待ち状態）
         self.instruction_panel = QFrame()
+        self.instruction_panel.setAttribute(Qt.WA_StyledBackground, True)
+        self._last_color = None
         self._set_panel_style("green")
 
         panel_layout = QVBoxLayout(self.instruction_panel)
         panel_layout.setContentsMargins(20, 18, 20, 14)
         panel_layout.setSpacing(8)
 
-        # 統合テキストラベル（ステップ番号 + タイトル + 詳細を1つのボックスに）
-        self.content_label = QLabel()
-        self.content_label.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
-        self.content_label.setWordWrap(True)
-        self.content_label.setTextFormat(Qt.RichText)
-        self.content_label.setStyleSheet(
-            "QLabel { color: white; background: transparent; font-size: 15px; line-height: 1.5; }"
-        )
-        panel_layout.addWidget(self.content_label, stretch=1)
+        # テキスト（ステップ番号 / タイトル / 詳細）。プレーンテキストで HTML 解析を避ける
+        text_layout = QVBoxLayout()
+        text_layout.setContentsMargins(0, 0, 0, 0)
+        text_layout.setSpacing(6)
+        self.step_label = _StepNumberLabel()
+        self.title_label = self._make_text_label(
+            "QLabel { color: white; background: transparent; font-size: 17px; font-weight: bold; }")
+        self.detail_label = self._make_text_label(
+            "QLabel { color: rgba(255,255,255,220); background: transparent; font-size: 14px; }")
+        text_layout.addWidget(self.step_label)
+        text_layout.addWidget(self.title_label)
+        text_layout.addWidget(self.detail_label)
+        text_layout.addStretch()
+        panel_layout.addLayout(text_layout, stretch=1)
 
         # ボタン
         button_layout = QHBoxLayout()
@@ -94,12 +192,8 @@ class TutorialOverlay(QWidget):
         button_layout.addWidget(self.prev_button)
 
         self.next_button = QPushButton("次へ ->")
-        self.next_button.setStyleSheet(
-            "QPushButton { background-color: rgba(255,255,255,220); color: #2E7D32;"
-            "  border: none; border-radius: 8px; padding: 8px 28px; font-size: 14px; font-weight: bold; }"
-            "QPushButton:hover { background-color: rgba(255,255,255,255); }"
-            "QPushButton:disabled { background-color: rgba(150,150,150,100); color: #666; }"
-        )
+        self.next_button.setStyleSheet(self._NEXT_BUTTON_STYLE)
+        self._next_button_ready = False
         self.next_button.setEnabled(False)
         button_layout.addWidget(self.next_button)
 
@@ -124,96 +218,94 @@ class TutorialOverlay(QWidget):
         self.geometry_changed_callback = None
         self.setMinimumSize(420, 160)
         self.setMouseTracking(True)
-        self.restore_timer = None
+        self.setAttribute(Qt.WA_StaticContents, True)
+        self._last_mask_geo = None
+        # ドラッグ/リサイズ中の移動はイベントループ1周分まとめて反映する
+        self._pending_pos = None
+        self._pending_size = None
+        self._geometry_update_scheduled = False
+        # ヒント表示後に通常表示へ戻すタイマー（使い回す）
+        self.restore_timer = QTimer(self)
+        self.restore_timer.setSingleShot(True)
+        self.restore_timer.timeout.connect(self._restore_from_hint)
 
         # 内部保持用
-        self._current_title = ""
         self._current_detail = ""
 
+    @staticmethod
+    def _make_text_label(style):
+        label = QLabel()
+        label.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
+        label.setWordWrap(True)
+        label.setTextFormat(Qt.PlainText)
+        label.setStyleSheet(style)
+        return label
+
+    # パネル配色ごとの完成済み QSS（切替のたびに文字列を組み立てない）
     _PANEL_STYLES = {
-        "green": "stop:0 rgba(76, 175, 80, 230), stop:1 rgba(56, 142, 60, 230)",
-        "red": "stop:0 rgba(244, 67, 54, 230), stop:1 rgba(229, 57, 53, 230)",
-        "blue": "stop:0 rgba(33, 150, 243, 230), stop:1 rgba(25, 118, 210, 230)",
-        "orange": "stop:0 rgba(255, 152, 0, 230), stop:1 rgba(245, 124, 0, 230)",
+        key: (f"QFrame {{ background: qlineargradient(x1:0,y1:0,x2:1,y2:0,{stops});"
+              "  border: 3px solid rgba(255,255,255,200); border-radius: 15px; padding: 10px; }")
+        for key, stops in (
+            ("green", "stop:0 rgba(76, 175, 80, 230), stop:1 rgba(56, 142, 60, 230)"),
+            ("red", "stop:0 rgba(244, 67, 54, 230), stop:1 rgba(229, 57, 53, 230)"),
+            ("blue", "stop:0 rgba(33, 150, 243, 230), stop:1 rgba(25, 118, 210, 230)"),
+            ("orange", "stop:0 rgba(255, 152, 0, 230), stop:1 rgba(245, 124, 0, 230)"),
+        )
     }
+    _HINT_COLORS = {"error": "red", "success": "blue"}
 
-    def _set_panel_style(self, color_key):
-        stops = self._PANEL_STYLES.get(color_key, self._PANEL_STYLES["green"])
-        self.instruction_panel.setStyleSheet(
-            f"QFrame {{ background: qlineargradient(x1:0,y1:0,x2:1,y2:0,{stops});"
-            "  border: 3px solid rgba(255,255,255,200); border-radius: 15px; padding: 10px; }"
-        )
+    _NEXT_BUTTON_STYLE = (
+        "QPushButton { background-color: rgba(255,255,255,220); color: #2E7D32;"
+        "  border: none; border-radius: 8px; padding: 8px 28px; font-size: 14px; font-weight: bold; }"
+        "QPushButton:hover { background-color: rgba(255,255,255,255); }"
+        "QPushButton:disabled { background-color: rgba(150,150,150,100); color: #666; }"
+    )
+    _NEXT_BUTTON_READY_STYLE = (
+        "QPushButton { background-color: rgba(76,175,80,255); color: white;"
+        "  border: none; border-radius: 8px; padding: 8px 28px; font-size: 14px; font-weight: bold; }"
+        "QPushButton:hover { background-color: rgba(56,142,60,255); }"
+    )
 
-    def _build_content_html(self, step_text, title, detail):
-        return (
-            f'<div style="margin-bottom:6px;">'
-            f'<span style="font-size:13px; color:rgba(255,255,255,200);">{step_text}</span>'
-            f'</div>'
-            f'<div style="margin-bottom:8px;">'
-            f'<span style="font-size:17px; font-weight:bold; color:white;">{title}</span>'
-            f'</div>'
-            f'<div>'
-            f'<span style="font-size:14px; color:rgba(255,255,255,220);">{detail}</span>'
-            f'</div>'
-        )
+    def _set_panel_style(self, color_key):
+        if color_key not in self._PANEL_STYLES:
+            color_key = "green"
+        if self._last_color == color_key:
+            return
+        self._last_color = color_key
+        self.instruction_panel.setStyleSheet(self._PANEL_STYLES[color_key])
 
     def set_instruction(self, step_num, total_steps, title, detail):
-        if self.restore_timer is not None:
-            self.restore_timer.stop()
-            self.restore_timer.deleteLater()
-            self.restore_timer = None
-        self._current_title = title
+        self.restore_timer.stop()
         self._current_detail = detail
-        step_text = f"ステップ {step_num}/{total_steps}"
-        self.content_label.setText(self._build_content_html(step_text, title, detail))
+        self.step_label.set_step(step_num, total_steps)
+        self.title_label.setText(title)
+        self.detail_label.setText(detail)
         self.next_button.setEnabled(False)
         self.prev_button.setEnabled(step_num > 1)
         self._set_panel_style("green")
-        self._current_step_text = step_text
 
     def enable_next_button(self):
         self.next_button.setEnabled(True)
-        self.next_button.setStyleSheet(
-            "QPushButton { background-color: rgba(76,175,80,255); color: white;"
-            "  border: none; border-radius: 8px; padding: 8px 28px; font-size: 14px; font-weight: bold; }"
-            "QPushButton:hover { background-color: rgba(56,142,60,255); }"
-        )
+        if not self._next_button_ready:
+            self._next_button_ready = True
+            self.next_button.setStyleSheet(self._NEXT_BUTTON_READY_STYLE)
 
     def show_hint(self, message, hint_type="info"):
         """hint_type: 'error', 'success', 'info'"""
-        if self.restore_timer is not None:
-            self.restore_timer.stop()
-            self.restore_timer.deleteLater()
-            self.restore_timer = None
-        if hint_type == "error":
-            self._set_panel_style("red")
-        elif hint_type == "success":
-            self._set_panel_style("blue")
-        else:
-            self._set_panel_style("orange")
-
-        step_text = getattr(self, '_current_step_text', '')
-        original_title = self._current_title
-        original_detail = self._current_detail
+        self.restore_timer.stop()
+        self._set_panel_style(self._HINT_COLORS.get(hint_type, "orange"))
 
         # ヒントメッセージを詳細部分に表示
-        self.content_label.setText(
-            self._build_content_html(step_text, original_title, message)
-        )
+        self.detail_label.setText(message)
 
         if hint_type == "success":
             return
-
-        self.restore_timer = QTimer(self)
-        self.restore_timer.setSingleShot(True)
-        self.restore_timer.timeout.connect(lambda: [
-            self._set_panel_style("green"),
-            self.content_label.setText(
-                self._build_content_html(step_text, original_title, original_detail)
-            )
-        ])
         self.restore_timer.start(2000)
 
+    def _restore_from_hint(self):
+        self._set_panel_style("green")
+        self.detail_label.setText(self._current_detail)
+
     def is_in_panel_area(self, pos):
         return self.instruction_panel.geometry().contains(pos)
 
@@ -244,10 +336,12 @@ class TutorialOverlay(QWidget):
                 delta = event.globalPosition().toPoint() - self.resize_start_pos
                 new_w = max(self.minimumWidth(), self.resize_start_geometry.width() + delta.x())
                 new_h = max(self.minimumHeight(), self.resize_start_geometry.height() + delta.y())
-                self.resize(new_w, new_h)
+                self._pending_size = (new_w, new_h)
+                self._schedule_geometry_update()
                 event.accept()
             elif self.drag_position is not None:
-                self.move(event.globalPosition().toPoint() - self.drag_position)
+                self._pending_pos = event.globalPosition().toPoint() - self.drag_position
+                self._schedule_geometry_update()
                 event.accept()
         else:
             pos = event.position().toPoint()
@@ -256,9 +350,25 @@ class TutorialOverlay(QWidget):
             else:
                 self.unsetCursor()
 
+    def _schedule_geometry_update(self):
+        if not self._geometry_update_scheduled:
+            self._geometry_update_scheduled = True
+            QTimer.singleShot(0, self._apply_pending_geometry)
+
+    def _apply_pending_geometry(self):
+        self._geometry_update_scheduled = False
+        if self._pending_pos is not None:
+            self.move(self._pending_pos)
+            self._pending_pos = None
+        if self._pending_size is not None:
+            self.resize(*self._pending_size)
+            self._pending_size = None
+
     def mouseReleaseEvent(self, event):
         if event.button() == Qt.LeftButton:
             if self.is_resizing or self.drag_position is not None:
+                # 保存前に保留中の位置/サイズを確定させる
+                self._apply_pending_geometry()
                 if self.geometry_changed_callback:
                     self.geometry_changed_callback()
             self.is_resizing = False
@@ -278,20 +388,112 @@ class TutorialOverlay(QWidget):
     def updateMask(self):
         if not self.instruction_panel:
             return
-        from PySide6.QtGui import QRegion, QPainterPath
         panel_rect = self.instruction_panel.geometry()
-        path = QPainterPath()
-        path.addRoundedRect(QRectF(panel_rect), 15, 15)
-        region = QRegion(path.toFillPolygon().toPolygon())
+        if panel_rect == self._last_mask_geo:
+            return
+        self._last_mask_geo = panel_rect
+        # 角丸矩形を「十字の2矩形 + 四隅の楕円」で組み立てる（ポリゴン化しない）
+        x, y, w, h = panel_rect.x(), panel_rect.y(), panel_rect.width(), panel_rect.height()
+        r = min(15, w // 2, h // 2)
+        d = 2 * r
+        region = QRegion(x + r, y, w - d, h) | QRegion(x, y + r, w, h - d)
+        for cx, cy in ((x, y), (x + w - d, y), (x, y + h - d), (x + w - d, y + h - d)):
+            region |= QRegion(cx, cy, d, d, QRegion.Ellipse)
         self.setMask(region)
 
 
+class _HighlightOverlay(QWidget):
+    """対象ウィジェットを囲む赤枠だけを描く、マウス透過の前面オーバーレイ"""
+
+    MARGIN = 4
+    PEN_WIDTH = 3
+
+    def __init__(self, host, target):
+        super().__init__(host)
+        self._target = target
+        self._alpha = 220
+        self.setAttribute(Qt.WA_TransparentForMouseEvents, True)
+        self.setAttribute(Qt.WA_NoSystemBackground, True)
+        self.setAttribute(Qt.WA_TranslucentBackground, True)
+        self.setFocusPolicy(Qt.NoFocus)
+        target.installEventFilter(self)
+        self._sync_geometry()
+        self.setVisible(not target.isHidden())
+        self.raise_()
+
+    def _sync_geometry(self):
+        m = self.MARGIN + 1  # アンチエイリアス分を1px含める
+        self.setGeometry(self._target.geometry().adjusted(-m, -m, m, m))
+        # 枠線の帯だけを合成・再描画対象にする（内側は対象ウィジェットがそのまま見える）
+        inner = self.PEN_WIDTH + 2
+        rect = self.rect()
+        self.setMask(QRegion(rect) - QRegion(rect.adjusted(inner, inner, -inner, -inner)))
+
+    def set_alpha(self, alpha):
+        alpha = int(alpha)
+        if alpha == self._alpha:
+            return
+        self._alpha = alpha
+        self.update()
+
+    def detach(self):
+        self._target.removeEventFilter(self)
+        self.hide()
+        self.deleteLater()
+
+    def eventFilter(self, obj, event):
+        if obj is self._target:
+            et = event.type()
+            if et in (QEvent.Move, QEvent.Resize):
+                self._sync_geometry()
+            elif et == QEvent.Show:
+                self._sync_geometry()
+                self.show()
+                self.raise_()
+            elif et == QEvent.Hide:
+                self.hide()
+        return False
+
+    def paintEvent(self, event):
+        half = self.PEN_WIDTH / 2.0 + 1
+        p = QPainter(self)
+        p.setRenderHint(QPainter.Antialiasing, True)
+        p.setPen(QPen(QColor(255, 60, 60, self._alpha), self.PEN_WIDTH))
+        p.setBrush(Qt.NoBrush)
+        p.drawRoundedRect(QRectF(self.rect()).adjusted(half, half, -half, -half), 8, 8)
+        p.end()
+
+
 class InteractiveTutorialManager(QObject):
     """インタラクティブチュートリアルの管理クラス（19ステップ＋操作検証）"""
 
     tutorial_completed = Signal()
     tutorial_skipped = Signal()
 
+    # 誤操作トークン -> それを引き起こし得るアプリ側イベント種別
+    _WRONG_ACTION_EVENTS = {
+        "brush_draw": "draw",
+        "eraser_mode": "mode",
+        "brush_mode": "mode",
+        "pan_mode": "mode",
+        "ww_wl_mode": "mode",
+    }
+
+    # チュートリアル用 ROI の (名前, 色)。初回の create_tutorial_rois で確定
+    _TUTORIAL_ROIS = None
+
+    # 誤操作トークン -> ビットフラグ
+    _WRONG_ACTION_FLAGS = {
+        "brush_draw": FLAG_BRUSH_DRAW,
+        "eraser_mode": FLAG_ERASER_MODE,
+        "brush_mode": FLAG_BRUSH_MODE,
+        "pan_mode": FLAG_PAN_MODE,
+        "ww_wl_mode": FLAG_WW_WL_MODE,
+    }
+
+    # モード切替系の誤操作ヒントを連発しないための間隔（秒）
+    _WRONG_ACTION_DEBOUNCE_SEC = 0.5
+
     def __init__(self, app):
         super().__init__()
         self.app = app
@@ -299,137 +501,148 @@ class InteractiveTutorialManager(QObject):
         self.is_active = False
         self.wrong_action_detected = False
 
-        self.steps = [
-            {"title": "左ドラッグでブラシを使ってみましょう",
-             "detail": "画像の上で左クリックしながらドラッグして、輪郭を描いてください",
-             "check": self.check_brush_draw,
-             "wrong_actions": ["eraser_mode", "pan_mode", "ww_wl_mode"],
-             "highlight_target": None},
-            {"title": "ブラシサイズバーでサイズを変更してみましょう",
-             "detail": "左側の「ブラシサイズ」スライダーを動かしてサイズを変更してください",
-             "check": self.check_brush_resize_slider,
-             "wrong_actions": ["brush_draw", "eraser_mode"],
-             "highlight_target": "brush_size_slider"},
-            {"title": "右ドラッグでブラシサイズを変更してみましょう",
-             "detail": "画像上で右クリックしながらドラッグしてブラシサイズを変更してください",
-             "check": self.check_right_drag_resize,
-             "wrong_actions": [],
-             "highlight_target": None},
-            {"title": "消しゴムモードに切り替えましょう",
-             "detail": "左側の「消しゴム」ボタンをクリックしてください",
-             "check": self.check_eraser_mode,
-             "wrong_actions": ["brush_draw", "pan_mode"],
-             "highlight_target": "eraser_radio"},
-            {"title": "消しゴムで消してみましょう",
-             "detail": "画像の上で左クリックしながらドラッグして、描いた輪郭を消してください",
-             "check": self.check_eraser_draw,
-             "wrong_actions": ["brush_mode"],
-             "highlight_target": None},
-            {"title": "消しゴムサイズを変更してみましょう",
-             "detail": "左側の「消しゴムサイズ」スライダーを動かしてサイズを変更してください",
-             "check": self.check_eraser_resize,
-             "wrong_actions": ["brush_mode"],
-             "highlight_target": "eraser_size_slider"},
-            {"title": "ブラシモードに戻りましょう",
-             "detail": "左側の「ブラシ」ボタンをクリックしてください",
-             "check": self.check_brush_mode_return,
-             "wrong_actions": ["pan_mode"],
-             "highlight_target": "brush_radio"},
-            {"title": "スクロールで移動してみましょう",
-             "detail": "マウスホイールまたは中ボタンドラッグでスライスを移動してください",
-             "check": self.check_slice_move,
-             "wrong_actions": ["eraser_mode", "pan_mode"],
-             "highlight_target": None},
-            {"title": "塗ってみましょう",
-             "detail": "別のスライスでブラシを使って描画してください",
-             "check": self.check_draw_after_slice_move,
-             "wrong_actions": ["eraser_mode", "pan_mode"],
-             "highlight_target": None},
-            {"title": "Shiftキーを押しながら消してみましょう",
-             "detail": "Shiftキーを押しながら左ドラッグすると一時的に消しゴムになります",
-             "check": self.check_shift_erase,
-             "wrong_actions": ["eraser_mode"],
-             "highlight_target": None},
-            {"title": "Ctrl+Zで元に戻してみましょう",
-             "detail": "Ctrl+Zキーを押して、直前の描画を元に戻してください（Undo）",
-             "check": self.check_undo,
-             "wrong_actions": [],
-             "highlight_target": None},
-            {"title": "Ctrl+Yでやり直してみましょう",
-             "detail": "Ctrl+Yキーを押して、元に戻した操作をやり直してください（Redo）",
-             "check": self.check_redo,
-             "wrong_actions": [],
-             "highlight_target": None},
-            {"title": "インターポレートを試してみましょう",
-             "detail": "マウスホイールで3スライス以上移動して別の場所を塗り、Enterキーを押してください（間が補間されます）",
-             "check": self.check_interpolate,
-             "wrong_actions": [],
-             "highlight_target": None},
-            {"title": "パン/ズームモードに切り替えましょう",
-             "detail": "左側の「パン/ズーム」ボタンをクリックしてください",
-             "check": self.check_pan_mode,
-             "wrong_actions": ["brush_draw"],
-             "highlight_target": "pan_radio"},
-            {"title": "パンで画像を移動してみましょう",
-             "detail": "パンモードのまま、画像上で左ドラッグして画像を移動してください",
-             "check": self.check_pan_drag,
-             "wrong_actions": [],
-             "highlight_target": None},
-            {"title": "パンモードでズームしてみましょう",
-             "detail": "パンモードのまま、マウスホイールを回してズームしてください",
-             "check": self.check_zoom,
-             "wrong_actions": [],
-             "highlight_target": None},
-            {"title": "表示をリセットしてみましょう",
-             "detail": "「表示リセット」ボタンをクリックして、ズームとパンをリセットしてください",
-             "check": self.check_reset_view,
-             "wrong_actions": [],
-             "highlight_target": "reset_view_button"},
-            {"title": "臓器_2を選択してみましょう",
-             "detail": "左側のROI一覧から「臓器_2」の名前をクリックして選択してください",
-             "check": self.check_roi_change,
-             "wrong_actions": [],
-             "highlight_target": "roi_list"},
-            {"title": "臓器_2で描いてみましょう",
-             "detail": "ブラシモードに戻して左ドラッグで輪郭を描いてください。臓器_1とは異なる色で描かれることを確認しましょう",
-             "check": self.check_roi2_draw,
-             "wrong_actions": [],
-             "highlight_target": None},
-        ]
+        self.steps = (
+            TutorialStep(title="左ドラッグでブラシを使ってみましょう",
+                         detail="画像の上で左クリックしながらドラッグして、輪郭を描いてください",
+                         trigger=("_last_draw_mode", 'brush', "brush_drawn"),
+                         wrong_actions=("eraser_mode", "pan_mode", "ww_wl_mode"),
+                         highlight_target=None),
+            TutorialStep(title="ブラシサイズバーでサイズを変更してみましょう",
+                         detail="左側の「ブラシサイズ」スライダーを動かしてサイズを変更してください",
+                         check=self.check_brush_resize_slider,
+                         wrong_actions=("brush_draw", "eraser_mode"),
+                         highlight_target="brush_size_slider"),
+            TutorialStep(title="右ドラッグでブラシサイズを変更してみましょう",
+                         detail="画像上で右クリックしながらドラッグしてブラシサイズを変更してください",
+                         trigger=("_right_drag_resize_used", True, "right_drag_resized"),
+                         wrong_actions=(),
+                         highlight_target=None),
+            TutorialStep(title="消しゴムモードに切り替えましょう",
+                         detail="左側の「消しゴム」ボタンをクリックしてください",
+                         trigger=("operation_mode", "eraser", "eraser_mode_activated"),
+                         wrong_actions=("brush_draw", "pan_mode"),
+                         highlight_target="eraser_radio"),
+            TutorialStep(title="消しゴムで消してみましょう",
+                         detail="画像の上で左クリックしながらドラッグして、描いた輪郭を消してください",
+                         trigger=("_last_draw_mode", 'eraser', "eraser_drawn"),
+                         wrong_actions=("brush_mode",),
+                         highlight_target=None),
+            TutorialStep(title="消しゴムサイズを変更してみましょう",
+                         detail="左側の「消しゴムサイズ」スライダーを動かしてサイズを変更してください",
+                         check=self.check_eraser_resize,
+                         wrong_actions=("brush_mode",),
+                         highlight_target="eraser_size_slider"),
+            TutorialStep(title="ブラシモードに戻りましょう",
+                         detail="左側の「ブラシ」ボタンをクリックしてください",
+                         trigger=("operation_mode", "brush", "brush_mode_returned"),
+                         wrong_actions=("pan_mode",),
+                         highlight_target="brush_radio"),
+            TutorialStep(title="スクロールで移動してみましょう",
+                         detail="マウスホイールまたは中ボタンドラッグでスライスを移動してください",
+                         check=self.check_slice_move,
+                         wrong_actions=("eraser_mode", "pan_mode"),
+                         highlight_target=None),
+            TutorialStep(title="塗ってみましょう",
+                         detail="別のスライスでブラシを使って描画してください",
+                         trigger=("_last_draw_mode", 'brush', "drawn_after_slice_move"),
+                         wrong_actions=("eraser_mode", "pan_mode"),
+                         highlight_target=None),
+            TutorialStep(title="Shiftキーを押しながら消してみましょう",
+                         detail="Shiftキーを押しながら左ドラッグすると一時的に消しゴムになります",
+                         trigger=("_shift_erase_used", True, "shift_erased"),
+                         wrong_actions=("eraser_mode",),
+                         highlight_target=None),
+            TutorialStep(title="Ctrl+Zで元に戻してみましょう",
+                         detail="Ctrl+Zキーを押して、直前の描画を元に戻してください（Undo）",
+                         trigger=("_undo_used", True, "undo_used"),
+                         wrong_actions=(),
+                         highlight_target=None),
+            TutorialStep(title="Ctrl+Yでやり直してみましょう",
+                         detail="Ctrl+Yキーを押して、元に戻した操作をやり直してください（Redo）",
+                         trigger=("_redo_used", True, "redo_used"),
+                         wrong_actions=(),
+                         highlight_target=None),
+            TutorialStep(title="インターポレートを試してみましょう",
+                         detail="マウスホイールで3スライス以上移動して別の場所を塗り、Enterキーを押してください（間が補間されます）",
+                         trigger=("_interpolate_executed", True, "interpolated"),
+                         wrong_actions=(),
+                         highlight_target=None),
+            TutorialStep(title="パン/ズームモードに切り替えましょう",
+                         detail="左側の「パン/ズーム」ボタンをクリックしてください",
+                         trigger=("operation_mode", "pan_zoom", "pan_mode_activated"),
+                         wrong_actions=("brush_draw",),
+                         highlight_target="pan_radio"),
+            TutorialStep(title="パンで画像を移動してみましょう",
+                         detail="パンモードのまま、画像上で左ドラッグして画像を移動してください",
+                         trigger=("_pan_dragged", True, "pan_dragged"),
+                         wrong_actions=(),
+                         highlight_target=None),
+            TutorialStep(title="パンモードでズームしてみましょう",
+                         detail="パンモードのまま、マウスホイールを回してズームしてください",
+                         trigger=("_zoom_changed", True, "zoomed"),
+                         wrong_actions=(),
+                         highlight_target=None),
+            TutorialStep(title="表示をリセットしてみましょう",
+                         detail="「表示リセット」ボタンをクリックして、ズームとパンをリセットしてください",
+                         trigger=("_view_reset", True, "view_reset"),
+                         wrong_actions=(),
+                         highlight_target="reset_view_button"),
+            TutorialStep(title="臓器_2を選択してみましょう",
+                         detail="左側のROI一覧から「臓器_2」の名前をクリックして選択してください",
+                         trigger=("current_roi_name", "臓器_2", "roi_changed"),
+                         wrong_actions=(),
+                         highlight_target="roi_list"),
+            TutorialStep(title="臓器_2で描いてみましょう",
+                         detail="ブラシモードに戻して左ドラッグで輪郭を描いてください。臓器_1とは異なる色で描かれることを確認しましょう",
+                         check=self.check_roi2_draw,
+                         wrong_actions=(),
+                         highlight_target=None),
+        )
+
+        # ステップごとの誤操作ビットマスク（self.steps と同じ並び）
+        flags = self._WRONG_ACTION_FLAGS
+        masks = []
+        for step in self.steps:
+            mask = 0
+            for action in step.wrong_actions:
+                mask |= flags[action]
+            masks.append(mask)
+        self._wrong_masks = tuple(masks)
+        self._wrong_last_fire = {}
 
         # 進行状態の追跡
-        self.brush_drawn = False
-        self.brush_resized_slider = False
-        self.eraser_mode_activated = False
-        self.eraser_drawn = False
-        self.eraser_resized = False
-        self.brush_mode_returned = False
-        self.slice_moved = False
-        self.drawn_after_slice_move = False
-        self.shift_erased = False
-        self.interpolated = False
-        self.pan_mode_activated = False
-        self.pan_dragged = False
-        self.zoomed = False
-        self.right_drag_resized = False
-        self.view_reset = False
-        self.undo_used = False
-        self.redo_used = False
-        self.roi_changed = False
-        self.roi2_drawn = False
+        self._progress = TutorialProgress()
 
         self.initial_brush_size = None
         self.initial_eraser_size = None
+        self.slice_before_move = None
         self.overlay = None
         self.last_undo_time = 0
         self.step_success_shown = False
-        self.check_timer = None
+        self._app_slots = []
+        self._wrong_kinds = frozenset()
         self.highlighted_widget = None
-        self.highlight_timer = None
+        self._widget_map = None
+        # 赤枠の点滅はアルファ値を往復させるアニメーションで駆動
+        self.highlight_anim = QVariantAnimation(self)
+        self.highlight_anim.setDuration(1200)
+        self.highlight_anim.setKeyValueAt(0.0, 220)
+        self.highlight_anim.setKeyValueAt(0.5, 60)
+        self.highlight_anim.setKeyValueAt(1.0, 220)
+        self.highlight_anim.setEasingCurve(QEasingCurve.InOutSine)
+        self.highlight_anim.setLoopCount(-1)
+        self.highlight_anim.valueChanged.connect(self._on_highlight_alpha)
         self._highlight_active = False
-        self._highlight_frame = None
+        self._highlight_painter = None
         self.config_manager = get_config_manager()
 
+        # オーバーレイ位置の保存はまとめて遅延書き込み
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(300)
+        self._save_timer.timeout.connect(self._flush_save)
+        self._last_saved_geo = None
+
     def save_overlay_geometry(self):
         if self.overlay and self.config_manager:
             geo = self.overlay.geometry()
@@ -437,11 +650,23 @@ class InteractiveTutorialManager(QObject):
                 return
             ts = {"overlay_x": geo.x(), "overlay_y": geo.y(),
                   "overlay_width": geo.width(), "overlay_height": geo.height()}
+            if ts == self._last_saved_geo:
+                return
             if not isinstance(self.config_manager.config, dict):
                 return
             self.config_manager.config.setdefault('tutorial_settings', {}).update(ts)
+            self._last_saved_geo = ts
+            self._save_timer.start()
+
+    def _flush_save(self):
+        self._save_timer.stop()
+        if self.config_manager:
             self.config_manager.save_config()
 
+    def _flush_pending_save(self):
+        if self._save_timer.isActive():
+            self._flush_save()
+
     def start(self):
         self.is_active = True
         self.current_step = 0
@@ -463,6 +688,8 @@ class InteractiveTutorialManager(QObject):
                 y = ts.get('overlay_y', default_y)
                 w = ts.get('overlay_width', default_w)
                 h = ts.get('overlay_height', default_h)
+                self._last_saved_geo = {"overlay_x": x, "overlay_y": y,
+                                        "overlay_width": w, "overlay_height": h}
             else:
                 x, y, w, h = default_x, default_y, default_w, default_h
             self.overlay.setGeometry(x, y, w, h)
@@ -471,31 +698,56 @@ class InteractiveTutorialManager(QObject):
         self.initial_brush_size = self.app.brush_size
         self.initial_eraser_size = self.app.eraser_size
 
-        self.check_timer = QTimer()
-        self.check_timer.timeout.connect(self.check_current_step)
-        self.check_timer.start(100)
+        self._connect_app_signals()
 
         self.create_tutorial_rois()
         self.show_current_step()
 
+    def _connect_app_signals(self):
+        """アプリの操作通知シグナルを購読（ポーリングせず状態変化時のみ判定）"""
+        self._disconnect_app_signals()
+        app = self.app
+        for signal, kind in (
+            (app.mode_changed, "mode"),
+            (app.draw_committed, "draw"),
+            (app.slice_changed, "slice"),
+            (app.undo_performed, "undo"),
+            (app.redo_performed, "redo"),
+            (app.tool_size_changed, "size"),
+            (app.view_changed, "view"),
+            (app.roi_selected, "roi"),
+            (app.interpolation_done, "interpolate"),
+        ):
+            slot = lambda *_args, kind=kind: self._on_app_event(kind)
+            signal.connect(slot)
+            self._app_slots.append((signal, slot))
+
+    def _disconnect_app_signals(self):
+        for signal, slot in self._app_slots:
+            try:
+                signal.disconnect(slot)
+            except (RuntimeError, TypeError):
+                pass
+        self._app_slots = []
+
+    def _on_app_event(self, kind):
+        if not self.is_active or self.step_success_shown:
+            return
+        self.check_current_step(kind)
+
     def create_tutorial_rois(self):
-        from app.common.styles import roi_color
+        rois = InteractiveTutorialManager._TUTORIAL_ROIS
+        if rois is None:
+            rois = InteractiveTutorialManager._TUTORIAL_ROIS = tuple(
+                (f"臓器_{i + 1}", roi_color(i)) for i in range(3))
+        names = [name for name, _ in rois]
+
         self.app.roi_color_map.clear()
+        self.app.roi_color_map.update(rois)
         self.app.roi_masks.clear()
-        if not hasattr(self.app, "roi_visibility"):
-            self.app.roi_visibility = {}
-        else:
-            self.app.roi_visibility.clear()
-
-        tutorial_rois = [
-            ("臓器_1", roi_color(0)),
-            ("臓器_2", roi_color(1)),
-            ("臓器_3", roi_color(2)),
-        ]
-        for roi_name, color in tutorial_rois:
-            self.app.roi_color_map[roi_name] = color
-            self.app.roi_masks[roi_name] = {}
-            self.app.roi_visibility[roi_name] = True
+        self.app.roi_masks.update((name, {}) for name in names)
+        self.app._mark_roi_edited()
+        self.app.roi_visibility = dict.fromkeys(names, True)
 
         self.app.update_roi_list()
         self.app.current_roi_name = "臓器_1"
@@ -508,15 +760,19 @@ class InteractiveTutorialManager(QObject):
         self.step_success_shown = False
         self.reset_step_flags()
         step = self.steps[self.current_step]
+        self._wrong_kinds = frozenset(
+            self._WRONG_ACTION_EVENTS[a] for a in step.wrong_actions)
         self.overlay.set_instruction(
-            self.current_step + 1, len(self.steps), step["title"], step["detail"])
+            self.current_step + 1, len(self.steps), step.title, step.detail)
         if self.current_step == len(self.steps) - 1:
             self.overlay.next_button.setText("完了")
-        highlight_target = step.get("highlight_target")
+        highlight_target = step.highlight_target
         if highlight_target:
             self.highlight_widget(highlight_target)
         else:
             self.clear_highlight()
+        # ステップ開始時点の状態で一度だけ判定（以降はイベント駆動）
+        self.check_current_step()
 
     def prev_step(self):
         if self.current_step > 0:
@@ -538,9 +794,8 @@ class InteractiveTutorialManager(QObject):
 
     def complete_tutorial(self):
         self.is_active = False
-        if self.check_timer:
-            self.check_timer.stop()
-            self.check_timer = None
+        self._disconnect_app_signals()
+        self._flush_pending_save()
         self.clear_highlight()
         if self.overlay:
             self.overlay.hide()
@@ -552,49 +807,46 @@ class InteractiveTutorialManager(QObject):
         self.tutorial_completed.emit()
 
     def reset_step_flags(self):
-        self.brush_drawn = False
-        self.brush_resized_slider = False
-        self.eraser_mode_activated = False
-        self.eraser_drawn = False
-        self.eraser_resized = False
-        self.brush_mode_returned = False
-        self.slice_moved = False
-        self.drawn_after_slice_move = False
-        self.shift_erased = False
-        self.interpolated = False
-        self.pan_mode_activated = False
-        self.pan_dragged = False
-        self.zoomed = False
-        self.right_drag_resized = False
-        self.view_reset = False
-        self.roi_changed = False
-
-        for attr in ('_last_draw_mode', '_last_resize_method'):
-            if hasattr(self.app, attr):
-                setattr(self.app, attr, None)
-        for attr in ('_shift_erase_used', '_interpolate_executed', '_roi_changed',
-                      '_zoom_changed', '_right_drag_resize_used', '_view_reset', '_pan_dragged'):
-            if hasattr(self.app, attr):
-                setattr(self.app, attr, False)
-
-        if hasattr(self.app, 'brush_size'):
-            self.initial_brush_size = self.app.brush_size
-        if hasattr(self.app, 'eraser_size'):
-            self.initial_eraser_size = self.app.eraser_size
+        self._progress = TutorialProgress()
+
+        app = self.app
+        app._last_draw_mode = None
+        app._last_resize_method = None
+        app._shift_erase_used = False
+        app._interpolate_executed = False
+        app._roi_changed = False
+        app._zoom_changed = False
+        app._right_drag_resize_used = False
+        app._view_reset = False
+        app._pan_dragged = False
+        app._undo_used = False
+        app._redo_used = False
+
+        self.initial_brush_size = app.brush_size
+        self.initial_eraser_size = app.eraser_size
+
+    # ハイライト名 -> アプリ側のウィジェット属性名
+    _HIGHLIGHT_WIDGET_ATTRS = {
+        "brush_size_slider": "brush_slider",
+        "eraser_size_slider": "eraser_slider",
+        "brush_radio": "brush_mode_btn",
+        "eraser_radio": "eraser_mode_btn",
+        "pan_radio": "pan_zoom_mode_btn",
+        "roi_list": "roi_listbox",
+        "reset_view_button": "reset_view_button",
+    }
 
     def get_widget_by_name(self, widget_name):
         if not widget_name:
             return None
-        widget_map = {
-            "brush_size_slider": getattr(self.app, 'brush_slider', None),
-            "eraser_size_slider": getattr(self.app, 'eraser_slider', None),
-            "brush_radio": getattr(self.app, 'brush_mode_btn', None),
-            "eraser_radio": getattr(self.app, 'eraser_mode_btn', None),
-            "pan_radio": getattr(self.app, 'pan_zoom_mode_btn', None),
-            "roi_list": getattr(self.app, 'roi_listbox', None),
-            "reset_view_button": getattr(self.app, 'reset_view_button', None),
-        }
-        return widget_map.get(widget_name)
+        if self._widget_map is None:
+            widget_map = {name: getattr(self.app, attr, None)
+                          for name, attr in self._HIGHLIGHT_WIDGET_ATTRS.items()}
+            # UI 構築前なら確定させず、次回また探す
+            if any(w is None for w in widget_map.values()):
+                return widget_map.get(widget_name)
+            self._widget_map = widget_map
+        return self._widget_map.get(widget_name)
 
     def highlight_widget(self, widget_name):
         self.clear_highlight()
@@ -604,54 +856,24 @@ class InteractiveTutorialManager(QObject):
         self.highlighted_widget = widget
         self._highlight_active = True
 
-        # ウィジェットのスタイルを触らず、上に透明フレームを重ねて赤枠を描画
+        # ウィジェットのスタイルを触らず、兄弟として前面に置いた透過オーバーレイに赤枠を描く
         parent = widget.parentWidget()
         if not parent:
             return
-        self._highlight_frame = QFrame(parent)
-        self._highlight_frame.setAttribute(Qt.WA_TransparentForMouseEvents, True)
-        geo = widget.geometry()
-        m = 4
-        self._highlight_frame.setGeometry(
-            geo.x() - m, geo.y() - m,
-            geo.width() + 2 * m, geo.height() + 2 * m)
-        self._highlight_frame.show()
-        self._highlight_frame.raise_()
-        self._set_highlight_border(True)
-
-        self.highlight_blink_state = False
-        self.highlight_timer = QTimer()
-        self.highlight_timer.timeout.connect(self._blink_highlight)
-        self.highlight_timer.start(600)
-
-    def _set_highlight_border(self, bright):
-        if not hasattr(self, '_highlight_frame') or not self._highlight_frame:
-            return
-        if bright:
-            self._highlight_frame.setStyleSheet(
-                "QFrame { border: 3px solid rgba(255, 60, 60, 220);"
-                " border-radius: 8px; background: transparent; }")
-        else:
-            self._highlight_frame.setStyleSheet(
-                "QFrame { border: 3px solid rgba(255, 60, 60, 60);"
-                " border-radius: 8px; background: transparent; }")
+        self._highlight_painter = _HighlightOverlay(parent, widget)
+        self.highlight_anim.start()
 
-    def _blink_highlight(self):
-        if not self._highlight_active:
-            return
-        self.highlight_blink_state = not self.highlight_blink_state
-        self._set_highlight_border(not self.highlight_blink_state)
+    def _on_highlight_alpha(self, value):
+        if self._highlight_painter is not None:
+            self._highlight_painter.set_alpha(value)
 
     def clear_highlight(self):
         self._highlight_active = False
-        if self.highlight_timer:
-            self.highlight_timer.stop()
-            self.highlight_timer.deleteLater()
-            self.highlight_timer = None
-        if hasattr(self, '_highlight_frame') and self._highlight_frame:
-            self._highlight_frame.hide()
-            self._highlight_frame.deleteLater()
-            self._highlight_frame = None
+        self.highlight_anim.stop()
+        painter = self._highlight_painter
+        if painter is not None:
+            self._highlight_painter = None
+            painter.detach()
         self.highlighted_widget = None
 
     def skip_tutorial(self):
@@ -661,9 +883,8 @@ class InteractiveTutorialManager(QObject):
             QMessageBox.Yes | QMessageBox.No)
         if reply == QMessageBox.Yes:
             self.is_active = False
-            if self.check_timer:
-                self.check_timer.stop()
-                self.check_timer = None
+            self._disconnect_app_signals()
+            self._flush_pending_save()
             self.clear_highlight()
             if self.overlay:
                 self.overlay.hide()
@@ -671,245 +892,221 @@ class InteractiveTutorialManager(QObject):
                 self.overlay = None
             self.tutorial_skipped.emit()
 
-    def check_current_step(self):
-        if not self.is_active or self.current_step >= len(self.steps):
+    def check_current_step(self, kind=None):
+        """現在ステップを判定。kind はきっかけとなったイベント種別（None はステップ開始時）"""
+        # 達成済みのステップは「次へ」待ちなので何も判定しない
+        if self.step_success_shown or not self.is_active or self.current_step >= len(self.steps):
             return
         step = self.steps[self.current_step]
-        check_result = step["check"](None)
-        if check_result:
-            if not self.step_success_shown:
-                self.step_success_shown = True
-                self.wrong_action_detected = False
-                if self.overlay:
-                    self.overlay.enable_next_button()
-                    self.overlay.show_hint("正解です！「次へ」ボタンをクリックして続けましょう", hint_type="success")
+        if self._evaluate(step):
+            self.step_success_shown = True
+            self.wrong_action_detected = False
+            if self.overlay:
+                self.overlay.enable_next_button()
+                self.overlay.show_hint("正解です！「次へ」ボタンをクリックして続けましょう", hint_type="success")
             return
-        if not self.step_success_shown:
-            wrong_action = self.detect_wrong_action(step)
+        if self._wrong_masks[self.current_step] and (kind is None or kind in self._wrong_kinds):
+            wrong_action = self.detect_wrong_action(self.current_step)
             if wrong_action:
                 if not self.wrong_action_detected:
                     self.wrong_action_detected = True
                     self.handle_wrong_action(wrong_action)
                     QTimer.singleShot(1000, lambda: setattr(self, 'wrong_action_detected', False))
 
-    def detect_wrong_action(self, step):
-        wrong_actions = step.get("wrong_actions", [])
-        for action in wrong_actions:
-            if action == "brush_draw":
-                if getattr(self.app, '_last_draw_mode', None) == 'brush':
-                    return "ブラシで描画しようとしています"
-            elif action == "eraser_mode":
-                if getattr(self.app, 'operation_mode', None) == "eraser":
-                    if not hasattr(self, '_last_eraser_check') or time.time() - self._last_eraser_check > 0.5:
-                        self._last_eraser_check = time.time()
-                        return "消しゴムモードに切り替えようとしています"
-            elif action == "brush_mode":
-                if getattr(self.app, 'operation_mode', None) == "brush":
-                    if not hasattr(self, '_last_brush_check') or time.time() - self._last_brush_check > 0.5:
-                        self._last_brush_check = time.time()
-                        return "ブラシモードに切り替えようとしています"
-            elif action == "pan_mode":
-                if getattr(self.app, 'operation_mode', None) == "pan_zoom":
-                    if not hasattr(self, '_last_pan_check') or time.time() - self._last_pan_check > 0.5:
-                        self._last_pan_check = time.time()
-                        return "パンモードに切り替えようとしています"
-            elif action == "ww_wl_mode":
-                if getattr(self.app, 'operation_mode', None) == "ww_wl":
-                    return "WW/WLモードに切り替えようとしています"
+    def detect_wrong_action(self, step_idx):
+        mask = self._wrong_masks[step_idx]
+        if not mask:
+            return None
+        app = self.app
+        if mask & FLAG_BRUSH_DRAW and app._last_draw_mode == 'brush':
+            return "ブラシで描画しようとしています"
+        mode = app.operation_mode
+        if mask & FLAG_ERASER_MODE and mode == "eraser" and self._wrong_debounce_ok(FLAG_ERASER_MODE):
+            return "消しゴムモードに切り替えようとしています"
+        if mask & FLAG_BRUSH_MODE and mode == "brush" and self._wrong_debounce_ok(FLAG_BRUSH_MODE):
+            return "ブラシモードに切り替えようとしています"
+        if mask & FLAG_PAN_MODE and mode == "pan_zoom" and self._wrong_debounce_ok(FLAG_PAN_MODE):
+            return "パンモードに切り替えようとしています"
+        if mask & FLAG_WW_WL_MODE and mode == "ww_wl":
+            return "WW/WLモードに切り替えようとしています"
         return None
 
+    def _wrong_debounce_ok(self, flag):
+        now = time.time()
+        if now - self._wrong_last_fire.get(flag, 0.0) <= self._WRONG_ACTION_DEBOUNCE_SEC:
+            return False
+        self._wrong_last_fire[flag] = now
+        return True
+
     def handle_wrong_action(self, message):
         if self.step_success_shown:
             return
         current_time = time.time()
         if current_time - self.last_undo_time > 1.0:
             self.last_undo_time = current_time
-            if hasattr(self.app, 'undo_last_edit') and callable(self.app.undo_last_edit):
-                try:
-                    self.app.undo_last_edit()
-                except Exception:
-                    pass
+            try:
+                self.app.undo_last_edit()
+            except Exception:
+                pass
         if self.overlay:
             self.overlay.show_hint(f"{message}\n指示に従った操作をしてください", hint_type="error")
 
-    # ---- 各ステップのチェック関数 ----
-
-    def check_brush_draw(self, event=None):
-        if getattr(self.app, '_last_draw_mode', None) == 'brush' and not self.brush_drawn:
-            self.brush_drawn = True
-            return True
-        return False
-
-    def check_brush_resize_slider(self, event=None):
-        current_size = getattr(self.app, 'brush_size', None)
-        if (current_size is not None and self.initial_brush_size is not None
-                and current_size != self.initial_brush_size
-                and getattr(self.app, '_last_resize_method', None) == 'slider'):
-            self.brush_resized_slider = True
-            return True
-        return False
-
-    def check_right_drag_resize(self, event=None):
-        if getattr(self.app, '_right_drag_resize_used', False) and not self.right_drag_resized:
-            self.right_drag_resized = True
-            return True
-        return False
-
-    def check_eraser_mode(self, event=None):
-        if getattr(self.app, 'operation_mode', None) == "eraser" and not self.eraser_mode_activated:
-            self.eraser_mode_activated = True
-            return True
-        return False
-
-    def check_eraser_draw(self, event=None):
-        if getattr(self.app, '_last_draw_mode', None) == 'eraser' and not self.eraser_drawn:
-            self.eraser_drawn = True
-            return True
-        return False
-
-    def check_eraser_resize(self, event=None):
-        current_size = getattr(self.app, 'eraser_size', None)
-        if (current_size is not None and self.initial_eraser_size is not None
-                and current_size != self.initial_eraser_size):
-            self.eraser_resized = True
-            return True
-        return False
-
-    def check_brush_mode_return(self, event=None):
-        if getattr(self.app, 'operation_mode', None) == "brush" and not self.brush_mode_returned:
-            self.brush_mode_returned = True
-            return True
-        return False
-
-    def check_slice_move(self, event=None):
-        if hasattr(self.app, 'current_axial'):
-            if not hasattr(self, 'slice_before_move'):
-                self.slice_before_move = self.app.current_axial
-                return False
-            if self.app.current_axial != self.slice_before_move and not self.slice_moved:
-                self.slice_moved = True
-                return True
-        return False
-
-    def check_draw_after_slice_move(self, event=None):
-        if getattr(self.app, '_last_draw_mode', None) == 'brush' and not self.drawn_after_slice_move:
-            self.drawn_after_slice_move = True
-            return True
-        return False
-
-    def check_shift_erase(self, event=None):
-        if getattr(self.app, '_shift_erase_used', False) and not self.shift_erased:
-            self.shift_erased = True
-            return True
-        return False
-
-    def check_undo(self, event=None):
-        if getattr(self.app, '_undo_used', False) and not self.undo_used:
-            self.undo_used = True
-            return True
-        return False
-
-    def check_redo(self, event=None):
-        if getattr(self.app, '_redo_used', False) and not self.redo_used:
-            self.redo_used = True
-            return True
-        return False
-
-    def check_interpolate(self, event=None):
-        if getattr(self.app, '_interpolate_executed', False) and not self.interpolated:
-            self.interpolated = True
-            return True
-        return False
+    # ---- 各ステップの達成判定 ----
 
-    def check_pan_mode(self, event=None):
-        if getattr(self.app, 'operation_mode', None) == "pan_zoom" and not self.pan_mode_activated:
-            self.pan_mode_activated = True
-            return True
-        return False
-
-    def check_pan_drag(self, event=None):
-        if getattr(self.app, '_pan_dragged', False) and not self.pan_dragged:
-            self.pan_dragged = True
-            return True
-        return False
-
-    def check_zoom(self, event=None):
-        if getattr(self.app, '_zoom_changed', False) and not self.zoomed:
-            self.zoomed = True
+    def _evaluate(self, step):
+        if step.check is not None:
+            return step.check()
+        attr, expected, flag = step.trigger
+        progress = self._progress
+        if getattr(progress, flag) or getattr(self.app, attr) != expected:
+            return False
+        setattr(progress, flag, True)
+        return True
+
+    def check_brush_resize_slider(self):
+        app = self.app
+        if (self.initial_brush_size is not None
+                and app.brush_size != self.initial_brush_size
+                and app._last_resize_method == 'slider'):
+            self._progress.brush_resized_slider = True
             return True
         return False
 
-    def check_reset_view(self, event=None):
-        if getattr(self.app, '_view_reset', False) and not self.view_reset:
-            self.view_reset = True
+    def check_eraser_resize(self):
+        if (self.initial_eraser_size is not None
+                and self.app.eraser_size != self.initial_eraser_size):
+            self._progress.eraser_resized = True
             return True
         return False
 
-    def check_roi_change(self, event=None):
-        if getattr(self.app, 'current_roi_name', None) == "臓器_2" and not self.roi_changed:
-            self.roi_changed = True
+    def check_slice_move(self):
+        current = self.app.current_axial
+        if self.slice_before_move is None:
+            self.slice_before_move = current
+            return False
+        if current != self.slice_before_move and not self._progress.slice_moved:
+            self._progress.slice_moved = True
             return True
         return False
 
-    def check_roi2_draw(self, event=None):
-        if getattr(self.app, 'current_roi_name', None) == "臓器_2":
-            roi2_masks = getattr(self.app, 'roi_masks', {}).get("臓器_2", {})
-            if roi2_masks and not self.roi2_drawn:
+    def check_roi2_draw(self):
+        if self.app.current_roi_name == "臓器_2":
+            roi2_masks = self.app.roi_masks.get("臓器_2", {})
+            if roi2_masks and not self._progress.roi2_drawn:
                 for mask in roi2_masks.values():
-                    if mask is not None and np.any(mask):
-                        self.roi2_drawn = True
+                    if mask is None:
+                        continue
+                    # 間引きサンプルで先に当たりを探し、外れたときだけ全走査
+                    flat = mask.ravel()
+                    if flat[::64].any() or flat.any():
+                        self._progress.roi2_drawn = True
                         return True
         return False
 
 
 # -------------------- 画像⇔QImage 変換 --------------------
-def to_qimage_u8(img2d: np.ndarray, levels=None) -> QImage:
-    a = np.asarray(img2d)
+_AUTO_LEVEL_BINS = 1024
+
+
+def _auto_levels(a: np.ndarray) -> Tuple[float, float]:
+    """表示用の 1%/99% レベルをヒストグラムから近似（ソート不要の1パス）"""
+    flat = a.ravel()
+    if flat.size == 0:
+        return 0.0, 1.0
+    value_range = None
+    if flat.dtype.kind == 'f':
+        # NaN は範囲指定ヒストグラムの範囲判定で落ちるので、マスク配列を作らず除外できる
+        lo, hi = np.fmin.reduce(flat), np.fmax.reduce(flat)
+        if np.isfinite(lo) and np.isfinite(hi):
+            value_range = (float(lo), float(hi))
+        else:
+            flat = flat[np.isfinite(flat)]
+            if flat.size == 0:
+                return 0.0, 1.0
+    hist, edges = np.histogram(flat, bins=_AUTO_LEVEL_BINS, range=value_range)
+    cdf = np.cumsum(hist)
+    total = cdf[-1]
+    lo = int(np.searchsorted(cdf, 0.01 * total))
+    hi = int(np.searchsorted(cdf, 0.99 * total))
+    return float(edges[lo]), float(edges[min(hi + 1, _AUTO_LEVEL_BINS)])
+
+
+def _rescale_f32(a: np.ndarray, vmin: float, vmax: float) -> np.ndarray:
+    """vmin..vmax を 0..255 に写した float32 配列（減算・スケール・クリップはインプレース）"""
+    work = np.subtract(a, vmin, dtype=np.float32)
+    np.multiply(work, 255.0 / (vmax - vmin), out=work)
+    np.clip(work, 0, 255, out=work)
+    return work
+
+
+# (dtype, vmin, vmax) -> 65536 要素の uint8 LUT（直近の WW/WL 分のみ保持）
+_U16_LUT_CACHE: Dict[Tuple[str, float, float], np.ndarray] = {}
+
+
+def _u16_lut(dtype: np.dtype, vmin: float, vmax: float) -> np.ndarray:
+    key = (dtype.str, vmin, vmax)
+    lut = _U16_LUT_CACHE.get(key)
+    if lut is None:
+        # uint16 として見た各ビットパターンを元の dtype の値に戻してから写像する
+        values = np.arange(65536, dtype=np.uint16).view(dtype)
+        lut = _rescale_f32(values, vmin, vmax).astype(np.uint8)
+        _U16_LUT_CACHE.clear()
+        _U16_LUT_CACHE[key] = lut
+    return lut
+
+
+def to_qimage_u8(img2d: np.ndarray, levels=None, out: Optional[np.ndarray] = None) -> QImage:
+    """2D 配列を表示用 Grayscale8 QImage に変換
+
+    out に同形状の uint8 配列を渡すと出力先として再利用する（QImage はその配列を参照する）。
+    """
+    a = img2d if type(img2d) is np.ndarray else np.asarray(img2d)
     if levels is None:
-        vmin, vmax = float(np.nanpercentile(a, 1)), float(np.nanpercentile(a, 99))
+        vmin, vmax = _auto_levels(a)
     else:
         vmin, vmax = float(levels[0]), float(levels[1])
     if not np.isfinite(vmin) or not np.isfinite(vmax) or vmax <= vmin:
         vmin, vmax = 0.0, 1.0
-    a = np.clip((a - vmin) * (255.0 / (vmax - vmin)), 0, 255).astype(np.uint8)
-    buf = np.ascontiguousarray(a)
+    if out is None or out.shape != a.shape or out.dtype != np.uint8:
+        out = np.empty(a.shape, dtype=np.uint8)
+    if a.dtype.kind in 'iu' and a.dtype.itemsize == 2:
+        # 16bit 整数（CT/MR で一般的）は WW/WL ごとの 65536 要素 LUT を引くだけにする
+        np.take(_u16_lut(a.dtype, vmin, vmax), a.view(np.uint16), out=out, mode='clip')
+    else:
+        np.copyto(out, _rescale_f32(a, vmin, vmax), casting='unsafe')
+    a = out
+    buf = a if a.flags.c_contiguous else np.ascontiguousarray(a)
     h, w = buf.shape
     qimg = QImage(buf.data, w, h, int(buf.strides[0]), QImage.Format_Grayscale8)
     qimg.ndarray = buf
     return qimg
 
 
-def create_colored_mask_qimage(mask: np.ndarray, color_rgba) -> QImage:
-    h, w = mask.shape
-    mask_u8 = mask.astype(np.uint8)
-    rgba = np.zeros((h, w, 4), dtype=np.uint8)
-    rgba[mask_u8 > 0] = color_rgba
-    rgba_flat = np.ascontiguousarray(rgba)
-    qimg = QImage(rgba_flat.data, w, h, w * 4, QImage.Format_RGBA8888)
-    qimg.ndarray = rgba_flat
-    return qimg
+_NAMED_RGB = {
+    'red': (255, 0, 0), 'blue': (0, 0, 255), 'green': (0, 255, 0),
+    'yellow': (255, 255, 0), 'purple': (128, 0, 128), 'orange': (255, 165, 0),
+    'pink': (255, 192, 203), 'brown': (165, 42, 42), 'cyan': (0, 255, 255),
+}
 
 
-def get_color_rgba(color_name: str, alpha: int = 100):
-    from PySide6.QtGui import QColor
-    color_map = {
-        'red': (255, 0, 0), 'blue': (0, 0, 255), 'green': (0, 255, 0),
-        'yellow': (255, 255, 0), 'purple': (128, 0, 128), 'orange': (255, 165, 0),
-        'pink': (255, 192, 203), 'brown': (165, 42, 42), 'cyan': (0, 255, 255),
-    }
-    if isinstance(color_name, str) and color_name.lower() in color_map:
-        r, g, b = color_map[color_name.lower()]
-        return [r, g, b, alpha]
+@lru_cache(maxsize=64)
+def _resolve_rgba(color_name, alpha):
+    if isinstance(color_name, str) and color_name.lower() in _NAMED_RGB:
+        r, g, b = _NAMED_RGB[color_name.lower()]
+        return (r, g, b, alpha)
     q = QColor(color_name)
     if q.isValid():
-        return [q.red(), q.green(), q.blue(), alpha]
-    return [255, 0, 0, alpha]
+        return (q.red(), q.green(), q.blue(), alpha)
+    return (255, 0, 0, alpha)
+
+
+def get_color_rgba(color_name: str, alpha: int = 100):
+    return list(_resolve_rgba(color_name, alpha))
 
 
 # -------------------- ブラシカーソル --------------------
 class BrushCursor:
     def __init__(self, radius=5, color_name="yellow", line_width=2):
-        from PySide6.QtGui import QColor
         self.item = QGraphicsEllipseItem()
         self.radius = radius
         self.line_width = int(line_width)
@@ -918,6 +1115,10 @@ class BrushCursor:
         self.item.setPen(pen)
         self.item.setBrush(QBrush())
         self.item.setAcceptedMouseButtons(Qt.NoButton)
+        # マウス移動ごとに呼ばれるので束縛メソッドを保持しておく
+        self._set_pos = self.item.setPos
+        self._set_item_visible = self.item.setVisible
+        self._visible = None
         self.set_radius(radius)
         self.set_visible(False)
 
@@ -927,10 +1128,16 @@ class BrushCursor:
         self.item.setRect(QRectF(-r, -r, 2*r, 2*r))
 
     def set_visible(self, visible):
-        self.item.setVisible(visible)
+        visible = bool(visible)
+        if visible != self._visible:
+            self._visible = visible
+            self._set_item_visible(visible)
+
+    def is_visible(self):
+        return bool(self._visible)
 
     def setPos(self, x, y):
-        self.item.setPos(float(x), float(y))
+        self._set_pos(float(x), float(y))
 
     def set_line_width(self, w: int):
         self.line_width = max(1, int(w))
@@ -940,7 +1147,6 @@ class BrushCursor:
         self.item.setPen(pen)
 
     def set_color_name(self, color_name: str):
-        from PySide6.QtGui import QColor
         pen = QPen(QColor(color_name), self.line_width)
         pen.setCosmetic(True)
         self.item.setPen(pen)
@@ -951,6 +1157,11 @@ class BrushCursor:
 
 class _GameKeyBlocker(QObject):
     """ゲーム時に Ctrl+O / Shift+O / Shift+S / Ctrl+S を横取りして無効化するフィルタ"""
+
+    _BLOCKED_EVENTS = frozenset({QEvent.ShortcutOverride, QEvent.KeyPress, QEvent.KeyRelease})
+    _BLOCKED_KEYS = frozenset({Qt.Key_O, Qt.Key_S})
+    _BLOCKED_MODS = Qt.ControlModifier | Qt.ShiftModifier
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self._block = False
@@ -961,18 +1172,27 @@ class _GameKeyBlocker(QObject):
     def eventFilter(self, obj, event):
         if not self._block:
             return False
-        et = event.type()
-        if et in (QEvent.ShortcutOverride, QEvent.KeyPress, QEvent.KeyRelease):
-            mods = event.modifiers()
-            key = event.key()
+        if event.type() in self._BLOCKED_EVENTS:
             # Ctrl+O / Ctrl+S もしくは Shift+O / Shift+S をブロック
-            if ((mods & Qt.ControlModifier and key in (Qt.Key_O, Qt.Key_S)) or
-                (mods & Qt.ShiftModifier  and key in (Qt.Key_O, Qt.Key_S))):
+            if event.key() in self._BLOCKED_KEYS and (event.modifiers() & self._BLOCKED_MODS):
                 event.accept()
                 return True
         return False
 
 
+# ホイール1ノッチ（120）あたりのズーム倍率。整数ノッチ分は前計算しておく
+_ZOOM_STEP = 1.15
+_ZOOM_STEP_FACTORS = {k: _ZOOM_STEP ** k for k in range(-20, 21)}
+
+
+def _wheel_zoom_factor(dy: int) -> float:
+    steps, rem = divmod(dy, 120)
+    if rem == 0:
+        factor = _ZOOM_STEP_FACTORS.get(steps)
+        if factor is not None:
+            return factor
+    return _ZOOM_STEP ** (dy / 120.0)
+
 
 # -------------------- 改良ビュー --------------------
 class ImprovedMedicalView(QGraphicsView):
@@ -991,6 +1211,8 @@ class ImprovedMedicalView(QGraphicsView):
             | QPainter.TextAntialiasing
         )
         self.setViewportUpdateMode(QGraphicsView.FullViewportUpdate)
+        # 標準アイテム（pixmap/line/ellipse）は paint 内で必要な状態を毎回設定するので保存・復元は不要
+        self.setOptimizationFlag(QGraphicsView.DontSavePainterState, True)
         self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         self.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
@@ -998,6 +1220,8 @@ class ImprovedMedicalView(QGraphicsView):
         self.setDragMode(QGraphicsView.NoDrag)
 
         self.scene = QGraphicsScene(self)
+        # アイテムは十数個で、輪郭の差し替え・十字線の移動が頻繁なため BSP 索引を持たない
+        self.scene.setItemIndexMethod(QGraphicsScene.NoIndex)
         self.setScene(self.scene)
 
         self.image_item = QGraphicsPixmapItem()
@@ -1012,16 +1236,19 @@ class ImprovedMedicalView(QGraphicsView):
 
         if self.view_type == "axial":
             self.brush_cursor = BrushCursor(5)
-            self.brush_cursor.get_graphics_item().setZValue(50)
-            self.scene.addItem(self.brush_cursor.get_graphics_item())
+            brush_item = self.brush_cursor.get_graphics_item()
+            brush_item.setZValue(50)
+            self.scene.addItem(brush_item)
         else:
             self.brush_cursor = None
 
         self.crosshair_items = {"ax": None, "sag": None, "cor": None}
+        self._crosshair_extent = {}
 
         self.img_w = 1
         self.img_h = 1
         self.base_scale = 1.0
+        self.zoom_scale = 1.0
         self._initialized = False
         self._fit_mode = True
         self.rotation_deg = -90
@@ -1033,39 +1260,37 @@ class ImprovedMedicalView(QGraphicsView):
         self.wl0 = 0
         self.ww0 = 0
 
+        # 中ドラッグ（スライス移動）／右ドラッグ（ブラシサイズ調整）の状態
+        self._middle_dragging = False
+        self._middle_last_pos = None
+        self._middle_drag_accum = 0.0
+        self._brush_drag_start_pos = None
+        self._brush_size_start = None
+        self._brush_size_adjusting = False
+        self._brush_size_anchor_scene = None
+        self._lock_brush_pos = False
+
+        # to_qimage_u8 の出力先（pixmap 化でコピーされるのでスライス間で使い回せる）
+        self._u8_scratch = None
+
     # --- 補間（描画品質） ---
     def set_interpolation(self, enabled: bool):
-        self._interp_enabled = bool(enabled)
+        enabled = bool(enabled)
+        if enabled == self._interp_enabled:
+            return
+        self._interp_enabled = enabled
         self.setRenderHint(QPainter.SmoothPixmapTransform, self._interp_enabled)
         mode = Qt.SmoothTransformation if self._interp_enabled else Qt.FastTransformation
-        try:
-            self.image_item.setTransformationMode(mode)
-        except AttributeError:
-            pass
+        self.image_item.setTransformationMode(mode)
         for it in self.mask_items.values():
-            try:
-                it.setTransformationMode(mode)
-            except AttributeError:
-                pass
+            it.setTransformationMode(mode)
         if self.temp_mask_item is not None:
-            try:
-                self.temp_mask_item.setTransformationMode(mode)
-            except AttributeError:
-                pass
-        if hasattr(self, "preview_item") and self.preview_item is not None:
-            try:
-                self.preview_item.setTransformationMode(mode)
-            except AttributeError:
-                pass
-
-        pix = self.image_item.pixmap()
-        if not pix.isNull():
-            self.image_item.setPixmap(pix.copy())
-            try:
-                self.image_item.setTransformationMode(mode)
-            except AttributeError:
-                pass
+            self.temp_mask_item.setTransformationMode(mode)
+        if self.preview_item is not None:
+            self.preview_item.setTransformationMode(mode)
 
+        # 画素を複製せずに再描画だけを要求する
+        self.image_item.update()
         self.scene.invalidate(self.scene.sceneRect(), QGraphicsScene.AllLayers)
         try:
             self.resetCachedContent()
@@ -1084,12 +1309,8 @@ class ImprovedMedicalView(QGraphicsView):
                                        self.img_h + 2 * margin_h))
 
     def set_slice_image(self, qimg: QImage):
+        # 補間モードは set_interpolation で image_item に設定済み（setPixmap では変わらない）
         self.image_item.setPixmap(QPixmap.fromImage(qimg))
-        mode = Qt.SmoothTransformation if getattr(self, "_interp_enabled", True) else Qt.FastTransformation
-        try:
-            self.image_item.setTransformationMode(mode)
-        except AttributeError:
-            pass
 
         w, h = qimg.width(), qimg.height()
         if not self._initialized:
@@ -1159,7 +1380,7 @@ class ImprovedMedicalView(QGraphicsView):
         return hypot(m.m11(), m.m12())
 
     def zoom_percent(self) -> int:
-        if not hasattr(self, "zoom_scale") or self.base_scale == 0:
+        if self.base_scale == 0:
             return 100
         return int(round(self.zoom_scale * 100))
 
@@ -1167,9 +1388,8 @@ class ImprovedMedicalView(QGraphicsView):
     def update_brush_cursor(self, scene_pos):
         if not self.brush_cursor or self.app.nifti_data is None:
             return
-        anchor = getattr(self, "_brush_size_anchor_scene", None)
-        lock = getattr(self, "_lock_brush_pos", False)
-        if lock and anchor is not None:
+        anchor = self._brush_size_anchor_scene
+        if self._lock_brush_pos and anchor is not None:
             scene_pos = anchor
         view_pos = self.mapToScene(self.mapFromScene(scene_pos))
         slice_data = self.app.get_slice_data(self.view_type, self.app.get_current_slice_for_view(self.view_type))
@@ -1192,27 +1412,23 @@ class ImprovedMedicalView(QGraphicsView):
 
         # パン/ズームモード：修飾キー不要でズーム
         if self.app.operation_mode == "pan_zoom" and dy != 0:
-            steps = dy / 120.0
-            factor = 1.15 ** steps
-            if not hasattr(self, "zoom_scale"):
-                self.zoom_scale = 1.0
+            factor = _wheel_zoom_factor(dy)
             self.zoom_scale = max(0.02, min(self.zoom_scale * factor, 100.0))
             self.setTransform(self._compose_transform(self.base_scale, self.zoom_scale))
             self._fit_mode = False
             self.app._zoom_changed = True
+            self.app.view_changed.emit()
             ev.accept()
             return
 
         # 他のモード：Ctrl+スクロールでズーム（従来通り）
         if (mods & Qt.ControlModifier) and dy != 0:
-            steps = dy / 120.0
-            factor = 1.15 ** steps
-            if not hasattr(self, "zoom_scale"):
-                self.zoom_scale = 1.0
+            factor = _wheel_zoom_factor(dy)
             self.zoom_scale = max(0.02, min(self.zoom_scale * factor, 100.0))
             self.setTransform(self._compose_transform(self.base_scale, self.zoom_scale))
             self._fit_mode = False
             self.app._zoom_changed = True
+            self.app.view_changed.emit()
             ev.accept()
             return
 
@@ -1252,11 +1468,7 @@ class ImprovedMedicalView(QGraphicsView):
                 self._cursor_hidden_by_middle = False
             # ブラシ円も非表示（Axialのみ持っている）
             if getattr(self, "brush_cursor", None):
-                try:
-                    item = self.brush_cursor.get_graphics_item()
-                    self._brush_visible_backup_middle = bool(item.isVisible())
-                except Exception:
-                    self._brush_visible_backup_middle = False
+                self._brush_visible_backup_middle = self.brush_cursor.is_visible()
                 self.brush_cursor.set_visible(False)
             ev.accept()
             return
@@ -1335,18 +1547,19 @@ class ImprovedMedicalView(QGraphicsView):
 
         # Axialのブラシカーソル更新（中ドラッグ中は常に隠す）
         if self.view_type == "axial":
-            if getattr(self, "_middle_dragging", False):
-                if getattr(self, "brush_cursor", None):
+            if self._middle_dragging:
+                if self.brush_cursor:
                     self.brush_cursor.set_visible(False)
             else:
-                if getattr(self, "_lock_brush_pos", False) and getattr(self, "_brush_size_anchor_scene", None) is not None:
+                if self._lock_brush_pos and self._brush_size_anchor_scene is not None:
                     self.update_brush_cursor(self._brush_size_anchor_scene)
                 else:
                     self.update_brush_cursor(scene_pos)
 
         # --- 中ボタンドラッグ中はスライス移動（全ビュー） ---
-        if getattr(self, "_middle_dragging", False) and (ev.buttons() & Qt.MiddleButton):
-            dy = ev.pos().y() - getattr(self, "_middle_last_pos", ev.pos()).y()
+        if self._middle_dragging and (ev.buttons() & Qt.MiddleButton):
+            last = self._middle_last_pos
+            dy = ev.pos().y() - last.y() if last is not None else 0
             self._middle_drag_accum += dy
             self._middle_last_pos = ev.pos()
 
@@ -1365,7 +1578,7 @@ class ImprovedMedicalView(QGraphicsView):
                         self.app.temp_mask = None
                         self.app.is_drawing = False
                         self.app.drawing_points = []
-                    self.app.update_display()
+                    self.app.request_display_update()
                     self.app.update_slice_labels()
             ev.accept()
             return
@@ -1383,13 +1596,13 @@ class ImprovedMedicalView(QGraphicsView):
                 dy = scene_pos.y() - self.wl_start.y()
                 new_wl = self.wl0 + (-dy) * 1.5
                 new_ww = max(1.0, self.ww0 + dx * 3.0)
-                self.app.set_window(new_wl, new_ww)
+                self.app.set_window(new_wl, new_ww, deferred=True)
                 ev.accept()
                 return
 
         # --- Axial: 右ドラッグ中の処理（ブラシサイズ調整） ---
         if self.view_type == "axial" and (ev.buttons() & Qt.RightButton):
-            if hasattr(self, "_brush_drag_start_pos") and hasattr(self, "_brush_size_start"):
+            if self._brush_drag_start_pos is not None and self._brush_size_start is not None:
                 dx = ev.pos().x() - self._brush_drag_start_pos.x()
                 new_size = int(self._brush_size_start + (dx / 3.0))
                 new_size = max(1, min(30, new_size))
@@ -1398,7 +1611,7 @@ class ImprovedMedicalView(QGraphicsView):
                     self.app.brush_slider.setValue(new_size)
                 elif self.app.operation_mode == "eraser":
                     self.app.eraser_slider.setValue(new_size)
-                if self.brush_cursor and getattr(self, "_brush_size_anchor_scene", None) is not None:
+                if self.brush_cursor and self._brush_size_anchor_scene is not None:
                     self.brush_cursor.setPos(self._brush_size_anchor_scene.x(), self._brush_size_anchor_scene.y())
                     self.brush_cursor.set_visible(True)
                 ev.accept()
@@ -1408,7 +1621,7 @@ class ImprovedMedicalView(QGraphicsView):
 
     def mouseReleaseEvent(self, ev):
         # 中ボタンドラッグ終了：OSカーソル＆ブラシ円を復帰
-        if ev.button() == Qt.MiddleButton and getattr(self, "_middle_dragging", False):
+        if ev.button() == Qt.MiddleButton and self._middle_dragging:
             self._middle_dragging = False
             self._middle_drag_accum = 0.0
             # OSカーソルを元へ
@@ -1437,6 +1650,7 @@ class ImprovedMedicalView(QGraphicsView):
             self.setDragMode(QGraphicsView.NoDrag)
             self.pan_mode = False
             self.app._pan_dragged = True
+            self.app.view_changed.emit()
 
         if self.drawing_mode and ev.button() == Qt.LeftButton and self.view_type == "axial":
             self.drawing_mode = False
@@ -1446,21 +1660,20 @@ class ImprovedMedicalView(QGraphicsView):
 
         if ev.button() == Qt.RightButton:
             # 右ドラッグでサイズ変更が行われた場合を追跡
-            if getattr(self, '_brush_size_adjusting', False):
-                start_size = getattr(self, '_brush_size_start', None)
+            if self._brush_size_adjusting:
+                start_size = self._brush_size_start
                 if start_size is not None:
                     current_size = (self.app.brush_size if self.app.operation_mode == "brush"
                                     else self.app.eraser_size)
                     if current_size != start_size:
                         self.app._right_drag_resize_used = True
+                        self.app.tool_size_changed.emit()
             self.wl_start = None
             self._brush_size_adjusting = False
             self._lock_brush_pos = False
             self._brush_size_anchor_scene = None
-            if hasattr(self, "_brush_drag_start_pos"):
-                self._brush_drag_start_pos = None
-            if hasattr(self, "_brush_size_start"):
-                self._brush_size_start = None
+            self._brush_drag_start_pos = None
+            self._brush_size_start = None
             if getattr(self, "_cursor_hidden", False):
                 try:
                     self.viewport().unsetCursor()
@@ -1483,32 +1696,51 @@ class ImprovedMedicalView(QGraphicsView):
         else:
             self.centerOn(prev_center)
 
-    # --- オーバーレイ更新（省略せず現状のまま） ---
-    def update_mask_overlays(self):
-        # 既存アイテムをクリーンアップ
-        for item in self.mask_items.values():
-            self.scene.removeItem(item)
-        self.mask_items.clear()
+    # --- オーバーレイ更新 ---
+    def _show_overlay(self, item: Optional[QGraphicsPixmapItem], pix: QPixmap, z: float) -> QGraphicsPixmapItem:
+        """永続オーバーレイアイテムに pix を表示する（未作成なら作成、同じ pixmap なら貼り直さない）"""
+        if item is None:
+            item = QGraphicsPixmapItem()
+            item.setTransformationMode(Qt.SmoothTransformation if self._interp_enabled else Qt.FastTransformation)
+            item.setAcceptedMouseButtons(Qt.NoButton)
+            # パン中は拡大縮小済みの輪郭をデバイス座標でキャッシュして再利用する
+            item.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
+            self.scene.addItem(item)
+        if item.pixmap().cacheKey() != pix.cacheKey():
+            item.setPixmap(pix)
+        item.setZValue(z)
+        item.setVisible(True)
+        return item
+
+    @staticmethod
+    def _hide_overlay(item: Optional[QGraphicsPixmapItem]):
+        if item is not None:
+            item.setVisible(False)
 
-        if getattr(self, "preview_item", None) is not None:
-            self.scene.removeItem(self.preview_item)
-            self.preview_item = None
+    def update_mask_overlays(self):
+        # アイテムは作り直さず、表示しないものを隠して使い回す
+        shown = set()
+        self._update_mask_overlays(shown)
+        for roi_name, item in list(self.mask_items.items()):
+            if roi_name not in self.app.roi_masks:
+                self.scene.removeItem(item)
+                del self.mask_items[roi_name]
+            elif roi_name not in shown:
+                item.setVisible(False)
+        self.update_crosshair_lines()
 
-        if self.temp_mask_item is not None:
-            self.scene.removeItem(self.temp_mask_item)
-            self.temp_mask_item = None
+    def _update_mask_overlays(self, shown: set):
+        self._hide_overlay(self.preview_item)
+        self._hide_overlay(self.temp_mask_item)
 
         if self.app.nifti_data is None:
-            self.update_crosshair_lines()
             return
 
         current_slice = self.app.get_current_slice_for_view(self.view_type)
         slice_data = self.app.get_slice_data(self.view_type, current_slice)
         if slice_data is None:
-            self.update_crosshair_lines()
             return
 
-        mode = Qt.SmoothTransformation if self._interp_enabled else Qt.FastTransformation
         curr_visible = getattr(self.app, "roi_visibility", {}).get(self.app.current_roi_name, True)
 
         # --- プレビュー（点線の輪郭） ---
@@ -1519,23 +1751,15 @@ class ImprovedMedicalView(QGraphicsView):
             color = self.app.roi_color_map.get(self.app.current_roi_name, 'red')
             color_rgba = get_color_rgba(color, 230)
             spacing = getattr(self.app, "preview_dot_spacing", 2)
-            qimg_prev = create_dotted_outline_qimage(
-                prev_mask, color_rgba, dot_radius=1, spacing=spacing, border_thickness=1
-            )
-            self.preview_item = QGraphicsPixmapItem(QPixmap.fromImage(qimg_prev))
-            try:
-                self.preview_item.setTransformationMode(mode)
-            except AttributeError:
-                pass
-            self.preview_item.setZValue(15)  # 最前面（確定輪郭より上）
-            self.preview_item.setAcceptedMouseButtons(Qt.NoButton)
-            self.scene.addItem(self.preview_item)
+            pix_prev = QPixmap.fromImage(create_dotted_outline_qimage(
+                prev_mask, color_rgba, dot_radius=1, spacing=spacing, border_thickness=1))
+            self.preview_item = self._show_overlay(self.preview_item, pix_prev, 15)  # 最前面（確定輪郭より上）
 
         # --- 確定済み ROI（実線の輪郭） ---
         # 描画中（temp_maskがある時）は、編集中のROIの確定済み輪郭を非表示にする
         is_editing_current_roi = (self.view_type == "axial"
                                   and self.app.temp_mask is not None
-                                  and np.any(self.app.temp_mask))
+                                  and bool(np.any(self.app.temp_mask)))
 
         if self.app.roi_masks:
             thickness = max(1, int(getattr(self.app, "roi_outline_thickness", 2)))
@@ -1546,68 +1770,39 @@ class ImprovedMedicalView(QGraphicsView):
                 # 現在編集中のROIは確定済み輪郭を非表示にする
                 if is_editing_current_roi and roi_name == self.app.current_roi_name:
                     continue
+                # get_roi_mask_for_view は空のとき None を返す
                 mask = self.app.get_roi_mask_for_view(roi_name, self.view_type, current_slice)
-                if mask is not None and np.any(mask):
+                if mask is not None:
                     color = self.app.roi_color_map.get(roi_name, 'red')
                     color_rgba = get_color_rgba(color, 255)
-                    qimg = create_outline_qimage(mask, color_rgba, thickness=thickness)
-                    item = QGraphicsPixmapItem(QPixmap.fromImage(qimg))
-                    try:
-                        item.setTransformationMode(mode)
-                    except AttributeError:
-                        pass
-                    item.setZValue(12)
-                    item.setAcceptedMouseButtons(Qt.NoButton)
-                    self.scene.addItem(item)
-                    self.mask_items[roi_name] = item
+                    pix = self.app._cached_outline(roi_name, self.view_type, current_slice,
+                                                   mask, color_rgba, thickness)
+                    self.mask_items[roi_name] = self._show_overlay(self.mask_items.get(roi_name), pix, 12)
+                    shown.add(roi_name)
 
         # --- テンポラリ描画（実線の輪郭） ---
         # 以前の塗りつぶし表示を輪郭表示に変更。
-        if (self.view_type == "axial"
-            and curr_visible
-            and self.app.temp_mask is not None
-            and np.any(self.app.temp_mask)):
+        if curr_visible and is_editing_current_roi:
             thickness = max(1, int(getattr(self.app, "roi_outline_thickness", 2)))
             color = self.app.roi_color_map.get(self.app.current_roi_name, 'red')
             color_rgba = get_color_rgba(color, 255)
-            qimg = create_outline_qimage(self.app.temp_mask, color_rgba, thickness=thickness)
-            self.temp_mask_item = QGraphicsPixmapItem(QPixmap.fromImage(qimg))
-            try:
-                self.temp_mask_item.setTransformationMode(mode)
-            except AttributeError:
-                pass
-            self.temp_mask_item.setZValue(14)  # 確定輪郭より上、プレビューより下
-            self.temp_mask_item.setAcceptedMouseButtons(Qt.NoButton)
-            self.scene.addItem(self.temp_mask_item)
-
-        self.update_crosshair_lines()
+            pix = QPixmap.fromImage(create_outline_qimage(self.app.temp_mask, color_rgba, thickness=thickness))
+            self.temp_mask_item = self._show_overlay(self.temp_mask_item, pix, 14)  # 確定輪郭より上、プレビューより下
 
     def update_temp_mask(self):
-        if self.temp_mask_item is not None:
-            self.scene.removeItem(self.temp_mask_item)
-            self.temp_mask_item = None
+        self._hide_overlay(self.temp_mask_item)
 
         curr_visible = getattr(self.app, "roi_visibility", {}).get(self.app.current_roi_name, True)
         if self.view_type == "axial" and curr_visible and self.app.temp_mask is not None and np.any(self.app.temp_mask):
             thickness = max(1, int(getattr(self.app, "roi_outline_thickness", 2)))
             color = self.app.roi_color_map.get(self.app.current_roi_name, 'red')
             color_rgba = get_color_rgba(color, 255)
-            qimg = create_outline_qimage(self.app.temp_mask, color_rgba, thickness=thickness)
-            self.temp_mask_item = QGraphicsPixmapItem(QPixmap.fromImage(qimg))
-            mode = Qt.SmoothTransformation if self._interp_enabled else Qt.FastTransformation
-            try:
-                self.temp_mask_item.setTransformationMode(mode)
-            except AttributeError:
-                pass
-            self.temp_mask_item.setZValue(10)
-            self.temp_mask_item.setAcceptedMouseButtons(Qt.NoButton)
-            self.scene.addItem(self.temp_mask_item)
+            pix = QPixmap.fromImage(create_outline_qimage(self.app.temp_mask, color_rgba, thickness=thickness))
+            self.temp_mask_item = self._show_overlay(self.temp_mask_item, pix, 10)
 
     def set_display_rotation(self, degrees: int):
         self.rotation_deg = int(degrees) % 360
-        base = getattr(self, "base_scale", 1.0)
-        zoom = getattr(self, "zoom_scale", 1.0)
-        self.setTransform(self._compose_transform(base, zoom))
+        self.setTransform(self._compose_transform(self.base_scale, self.zoom_scale))
         self.centerOn(self.img_w * 0.5, self.img_h * 0.5)
 
     def rotate_display_step(self, delta_deg: int):
@@ -1615,9 +1810,7 @@ class ImprovedMedicalView(QGraphicsView):
 
     # 点線プレビュー
     def update_preview_overlays(self):
-        if self.preview_item is not None:
-            self.scene.removeItem(self.preview_item)
-            self.preview_item = None
+        self._hide_overlay(self.preview_item)
         if self.app.nifti_data is None:
             return
         if not getattr(self.app, "roi_visibility", {}).get(self.app.current_roi_name, True):
@@ -1629,85 +1822,66 @@ class ImprovedMedicalView(QGraphicsView):
         color = self.app.roi_color_map.get(self.app.current_roi_name, 'red')
         color_rgba = get_color_rgba(color, 230)
         spacing = self.app.preview_dot_spacing
-        qimg = create_dotted_outline_qimage(
-            mask, color_rgba, dot_radius=1, spacing=spacing, border_thickness=1
-        )
-        self.preview_item = QGraphicsPixmapItem(QPixmap.fromImage(qimg))
-        try:
-            self.preview_item.setTransformationMode(
-                Qt.SmoothTransformation if self._interp_enabled else Qt.FastTransformation
-            )
-        except AttributeError:
-            pass
-        self.preview_item.setZValue(15)
-        self.preview_item.setAcceptedMouseButtons(Qt.NoButton)
-        self.scene.addItem(self.preview_item)
+        pix = QPixmap.fromImage(create_dotted_outline_qimage(
+            mask, color_rgba, dot_radius=1, spacing=spacing, border_thickness=1))
+        self.preview_item = self._show_overlay(self.preview_item, pix, 15)
+
+    # 十字線: 色、ビューごとの (横線, 縦線, 非表示) の割り当て、位置を決めるスライス番号
+    _CROSSHAIR_COLORS = {"ax": QColor(0, 255, 255), "sag": QColor(255, 0, 255), "cor": QColor(255, 255, 0)}
+    _CROSSHAIR_LAYOUT = {
+        "axial":    ("sag", "cor", "ax"),
+        "sagittal": ("cor", "ax",  "sag"),
+        "coronal":  ("sag", "ax",  "cor"),
+    }
+    _CROSSHAIR_SLICE_ATTR = {"ax": "current_axial", "sag": "current_sagittal", "cor": "current_coronal"}
+
+    def _hide_crosshairs(self):
+        for line in self.crosshair_items.values():
+            if line:
+                line.setVisible(False)
+
+    def _crosshair_line(self, key: str, horizontal: bool, w: int, h: int) -> QGraphicsLineItem:
+        """十字線アイテムを返す。線の形は画像サイズが変わったときだけ設定し、位置は setPos で動かす"""
+        line = self.crosshair_items.get(key)
+        if line is None:
+            line = QGraphicsLineItem()
+            pen = QPen(self._CROSSHAIR_COLORS[key], 1)
+            pen.setCosmetic(True)
+            pen.setStyle(Qt.DashLine)
+            line.setPen(pen)
+            line.setZValue(20)
+            line.setAcceptedMouseButtons(Qt.NoButton)
+            self.scene.addItem(line)
+            self.crosshair_items[key] = line
+        extent = (horizontal, w, h)
+        if self._crosshair_extent.get(key) != extent:
+            if horizontal:
+                line.setLine(0.0, 0.0, float(w - 1), 0.0)
+            else:
+                line.setLine(0.0, 0.0, 0.0, float(h - 1))
+            self._crosshair_extent[key] = extent
+        line.setVisible(True)
+        return line
 
     def update_crosshair_lines(self):
-        from PySide6.QtWidgets import QGraphicsLineItem
-        from PySide6.QtGui import QColor
         if self.app.nifti_data is None:
-            for k in self.crosshair_items:
-                if self.crosshair_items[k]:
-                    self.crosshair_items[k].setVisible(False)
+            self._hide_crosshairs()
             return
         current_slice = self.app.get_current_slice_for_view(self.view_type)
         slice_data = self.app.get_slice_data(self.view_type, current_slice)
         if slice_data is None:
-            for k in self.crosshair_items:
-                if self.crosshair_items[k]:
-                    self.crosshair_items[k].setVisible(False)
+            self._hide_crosshairs()
             return
         h, w = slice_data.shape
 
-        def ensure_line(key: str, color: QColor, z: float):
-            line = self.crosshair_items.get(key)
-            if line is None:
-                line = QGraphicsLineItem()
-                pen = QPen(color, 1)
-                pen.setCosmetic(True)
-                pen.setStyle(Qt.DashLine)
-                line.setPen(pen)
-                line.setZValue(z)
-                line.setAcceptedMouseButtons(Qt.NoButton)
-                self.scene.addItem(line)
-                self.crosshair_items[key] = line
-            line.setVisible(True)
-            return line
-
-        col_ax  = QColor(0, 255, 255)
-        col_sag = QColor(255, 0, 255)
-        col_cor = QColor(255, 255, 0)
-
-        if self.view_type == "axial":
-            r_sag = int(np.clip(self.app.current_sagittal, 0, h-1))
-            c_cor = int(np.clip(self.app.current_coronal,  0, w-1))
-            sag_line = ensure_line("sag", col_sag, 20)
-            cor_line = ensure_line("cor", col_cor, 20)
-            sag_line.setLine(0, float(r_sag), float(w-1), float(r_sag))
-            cor_line.setLine(float(c_cor), 0, float(c_cor), float(h-1))
-            if self.crosshair_items.get("ax"):
-                self.crosshair_items["ax"].setVisible(False)
-
-        elif self.view_type == "sagittal":
-            r_cor = int(np.clip(self.app.current_coronal, 0, h-1))
-            c_ax  = int(np.clip(self.app.current_axial,   0, w-1))
-            cor_line = ensure_line("cor", col_cor, 20)
-            ax_line  = ensure_line("ax",  col_ax,  20)
-            cor_line.setLine(0, float(r_cor), float(w-1), float(r_cor))
-            ax_line.setLine(float(c_ax), 0, float(c_ax), float(h-1))
-            if self.crosshair_items.get("sag"):
-                self.crosshair_items["sag"].setVisible(False)
-
-        else:
-            r_sag = int(np.clip(self.app.current_sagittal, 0, h-1))
-            c_ax  = int(np.clip(self.app.current_axial,    0, w-1))
-            sag_line = ensure_line("sag", col_sag, 20)
-            ax_line  = ensure_line("ax",  col_ax,  20)
-            sag_line.setLine(0, float(r_sag), float(w-1), float(r_sag))
-            ax_line.setLine(float(c_ax), 0, float(c_ax), float(h-1))
-            if self.crosshair_items.get("cor"):
-                self.crosshair_items["cor"].setVisible(False)
+        h_key, v_key, hidden_key = self._CROSSHAIR_LAYOUT.get(self.view_type, self._CROSSHAIR_LAYOUT["coronal"])
+        row = min(max(int(getattr(self.app, self._CROSSHAIR_SLICE_ATTR[h_key])), 0), h - 1)
+        col = min(max(int(getattr(self.app, self._CROSSHAIR_SLICE_ATTR[v_key])), 0), w - 1)
+        self._crosshair_line(h_key, True, w, h).setPos(0.0, float(row))
+        self._crosshair_line(v_key, False, w, h).setPos(float(col), 0.0)
+        hidden = self.crosshair_items.get(hidden_key)
+        if hidden:
+            hidden.setVisible(False)
 
 
 # -------------------- メインアプリ --------------------
@@ -1715,6 +1889,17 @@ class SimpleNiftiContouringApp(QMainWindow):
     # カスタムシグナル: ウィンドウが閉じる前に発火
     window_closing = Signal()
 
+    # チュートリアル用の操作通知（状態が変わった箇所から発火）
+    mode_changed = Signal(str)
+    draw_committed = Signal(str)
+    slice_changed = Signal(int)
+    undo_performed = Signal()
+    redo_performed = Signal()
+    tool_size_changed = Signal()
+    view_changed = Signal()
+    roi_selected = Signal(str)
+    interpolation_done = Signal()
+
     def __init__(self):
         super().__init__()
 
@@ -1744,9 +1929,11 @@ class SimpleNiftiContouringApp(QMainWindow):
         # ROI / 描画
         self.roi_masks = {}
         self.current_roi_name = "ROI_1"
+        # 輪郭キャッシュ用の編集世代（ROIごと／全ROI一括）。roi_masks を書き換えたら _mark_roi_edited で進める
+        self._roi_mask_gen: Dict[str, int] = {}
+        self._roi_mask_epoch = 0
 
         # ★ ROI色は固定パレットから順番に割り当て
-        from app.common.styles import ROI_PALETTE, roi_color
         self.roi_colors = list(ROI_PALETTE)
         self.roi_color_map = {"ROI_1": roi_color(0)}
 
@@ -1835,21 +2022,56 @@ class SimpleNiftiContouringApp(QMainWindow):
         self.preview_timer.setSingleShot(True)
         self.preview_timer.timeout.connect(self.recompute_interpolation_preview)
 
+        # ドラッグ中の再描画はまとめて1フレーム（update_interval）に1回にする
+        self._display_timer = QTimer(self)
+        self._display_timer.setSingleShot(True)
+        self._display_timer.setInterval(int(self.update_interval * 1000))
+        self._display_timer.timeout.connect(self.update_display)
+
         # 表示カスタム
         self.roi_outline_thickness = 1
         self.preview_dot_spacing   = 3
 
+        # 輪郭 QPixmap の LRU（ROI・ビュー・スライス・編集世代・色・太さが同じなら再ラスタライズしない）
+        self._outline_cache: "OrderedDict[tuple, QPixmap]" = OrderedDict()
+
         # UI
         self.setup_ui()
         self.setup_timers()
 
+    _OUTLINE_CACHE_SIZE = 64
+
+    def _mark_roi_edited(self, roi_name: Optional[str] = None):
+        """roi_masks の変更を輪郭キャッシュに知らせる。roi_name=None は全ROI（読込・反転・改名など）"""
+        if roi_name is None:
+            self._roi_mask_epoch += 1
+        else:
+            self._roi_mask_gen[roi_name] = self._roi_mask_gen.get(roi_name, 0) + 1
+
+    def _cached_outline(self, roi_name: str, view_type: str, slice_idx: int,
+                        mask, color_rgba, thickness: int = 2) -> QPixmap:
+        """確定済みROIの輪郭 QPixmap を返す。パンや WW/WL 変更などマスク不変の再描画ではキャッシュを使う"""
+        # マスク内容は見ず、編集のたびに進む世代番号で同一性を判定する
+        key = (roi_name, view_type, int(slice_idx), self._roi_mask_epoch,
+               self._roi_mask_gen.get(roi_name, 0), tuple(color_rgba), int(thickness))
+        cache = self._outline_cache
+        pix = cache.get(key)
+        if pix is not None:
+            cache.move_to_end(key)
+            return pix
+        pix = QPixmap.fromImage(create_outline_qimage(mask, color_rgba, thickness=thickness))
+        cache[key] = pix
+        if len(cache) > self._OUTLINE_CACHE_SIZE:
+            cache.popitem(last=False)
+        return pix
+
     def _precompute_brush_kernels(self):
+        # サイズごとに円内画素の (dy, dx) オフセットを int16 の別々の配列で持つ
         for size in range(1, 31):
             y, x = np.ogrid[-size:size+1, -size:size+1]
             kernel = (x*x + y*y) <= size*size
-            coords = np.column_stack(np.where(kernel))
-            coords = coords - size
-            self.brush_kernels[size] = coords
+            dy, dx = np.nonzero(kernel)
+            self.brush_kernels[size] = ((dy - size).astype(np.int16), (dx - size).astype(np.int16))
 
     # -------------------- UI --------------------
     def setup_ui(self):
@@ -2262,6 +2484,7 @@ class SimpleNiftiContouringApp(QMainWindow):
         if view_type == "axial":
             self.current_axial = slice_idx
             self.axial_slider.setValue(slice_idx)
+            self.slice_changed.emit(slice_idx)
         elif view_type == "sagittal":
             self.current_sagittal = slice_idx
             self.sagittal_slider.setValue(slice_idx)
@@ -2304,8 +2527,9 @@ class SimpleNiftiContouringApp(QMainWindow):
             if x < 0 or x >= h:
                 return None
             sagittal_mask = np.zeros((w, d), dtype=bool)
+            # 空スライスの行/列を写しても結果は変わらないので、スライスごとの全画素走査はしない
             for z_slice, mask in self.roi_masks[roi_name].items():
-                if mask is None or not np.any(mask):
+                if mask is None:
                     continue
                 if x < mask.shape[0]:
                     sagittal_mask[:, z_slice] = mask[x, :]
@@ -2316,8 +2540,9 @@ class SimpleNiftiContouringApp(QMainWindow):
             if y < 0 or y >= w:
                 return None
             coronal_mask = np.zeros((h, d), dtype=bool)
+            # 空スライスの行/列を写しても結果は変わらないので、スライスごとの全画素走査はしない
             for z_slice, mask in self.roi_masks[roi_name].items():
-                if mask is None or not np.any(mask):
+                if mask is None:
                     continue
                 if y < mask.shape[1]:
                     coronal_mask[:, z_slice] = mask[:, y]
@@ -2449,6 +2674,7 @@ class SimpleNiftiContouringApp(QMainWindow):
 
             # マスク初期化
             self.roi_masks = {}
+            self._mark_roi_edited()
             # 既定色セットが30色に拡張済みの前提
             self.roi_color_map = {"ROI_1": self.roi_colors[0] if hasattr(self, "roi_colors") else 'red'}
             self.current_roi_name = "ROI_1"
@@ -2481,7 +2707,13 @@ class SimpleNiftiContouringApp(QMainWindow):
             except Exception:
                 pass
 
+    def request_display_update(self):
+        """update_display を次のフレームにまとめて行う（連続するドラッグイベント用）"""
+        if not self._display_timer.isActive():
+            self._display_timer.start()
+
     def update_display(self):
+        self._display_timer.stop()
         if self.nifti_data is None:
             return
         vmin = self.window_level - self.window_width / 2
@@ -2495,7 +2727,8 @@ class SimpleNiftiContouringApp(QMainWindow):
         for view, view_type, slice_idx in views:
             slice_data = self.get_slice_data(view_type, slice_idx)
             if slice_data is not None:
-                qimg = to_qimage_u8(slice_data, levels)
+                qimg = to_qimage_u8(slice_data, levels, out=view._u8_scratch)
+                view._u8_scratch = qimg.ndarray
                 view.set_slice_image(qimg)
                 view.update_mask_overlays()
                 view.update_temp_mask()
@@ -2515,6 +2748,7 @@ class SimpleNiftiContouringApp(QMainWindow):
         self.last_draw_pos = None
         self.update_display()
         self.update_slice_labels()
+        self.slice_changed.emit(new_slice)
 
     def update_sagittal_slice(self, value):
         if self.nifti_data is None:
@@ -2564,6 +2798,7 @@ class SimpleNiftiContouringApp(QMainWindow):
         if self.operation_mode == "brush":
             if hasattr(self.axial_view, 'brush_cursor') and self.axial_view.brush_cursor:
                 self.axial_view.brush_cursor.set_radius(value)
+        self.tool_size_changed.emit()
 
     def update_eraser_size(self, value):
         self.eraser_size = value
@@ -2573,6 +2808,7 @@ class SimpleNiftiContouringApp(QMainWindow):
         if self.operation_mode == "eraser":
             if hasattr(self.axial_view, 'brush_cursor') and self.axial_view.brush_cursor:
                 self.axial_view.brush_cursor.set_radius(value)
+        self.tool_size_changed.emit()
 
     def on_mode_changed(self, button):
         """操作モード切替ハンドラ"""
@@ -2598,6 +2834,7 @@ class SimpleNiftiContouringApp(QMainWindow):
             self.operation_mode = "ww_wl"
             self.mode_status_label.setText("現在: WW/WL調整モード")
             self.mode_status_label.setStyleSheet("font-weight: bold; color: #9C27B0; padding: 4px;")
+        self.mode_changed.emit(self.operation_mode)
 
     # --- 描画開始/継続/終了（略：元の実装を維持） ---
     def start_drawing(self, scene_pos):
@@ -2697,9 +2934,9 @@ class SimpleNiftiContouringApp(QMainWindow):
 
         self.last_draw_pos = (row, col)
         self.drawing_points.append((row, col))
-        # リアルタイム反映：temp_maskをroi_masksに即座に反映
+        # リアルタイム反映：temp_maskをroi_masksに即座に反映（表示は次フレームでまとめて更新）
         self._apply_temp_mask_to_roi()
-        self.update_display()
+        self.request_display_update()
 
     def finish_drawing(self):
         """描画終了：ROIベースで閉ループが出来ていたら内側を確実に塗りつぶす"""
@@ -2769,6 +3006,9 @@ class SimpleNiftiContouringApp(QMainWindow):
         if getattr(self, "auto_preview_enabled", True):
             self.recompute_preview_for_current_roi()
 
+        if self._last_draw_mode is not None:
+            self.draw_committed.emit(self._last_draw_mode)
+
     def undo_last_edit(self):
         """最後の編集をアンドゥ（最大40段階）。インターポレート確定の一括変更は1ステップ扱い。"""
         if not hasattr(self, "undo_stack") or len(self.undo_stack) == 0:
@@ -2802,8 +3042,10 @@ class SimpleNiftiContouringApp(QMainWindow):
 
             # グループとしてRedoに積む
             self.redo_stack.append({"group": True, "changes": redo_changes})
+            self._mark_roi_edited()
             self.update_display()
             self.recompute_preview_for_current_roi()
+            self.undo_performed.emit()
             return
 
         # --- 通常（1スライス）のUndo ---
@@ -2825,8 +3067,10 @@ class SimpleNiftiContouringApp(QMainWindow):
         else:
             self.roi_masks[roi_name][z_slice] = prev_mask.copy()
 
+        self._mark_roi_edited()
         self.update_display()
         self.recompute_preview_for_current_roi()
+        self.undo_performed.emit()
 
     def redo_last_edit(self):
         """やり直し（最大40段階）。インターポレート確定の一括変更は1ステップ扱い。"""
@@ -2861,8 +3105,10 @@ class SimpleNiftiContouringApp(QMainWindow):
 
             # グループとしてUndoに積む
             self.undo_stack.append({"group": True, "changes": undo_changes})
+            self._mark_roi_edited()
             self.update_display()
             self.recompute_preview_for_current_roi()
+            self.redo_performed.emit()
             return
 
         # --- 通常（1スライス）のRedo ---
@@ -2884,8 +3130,10 @@ class SimpleNiftiContouringApp(QMainWindow):
         else:
             self.roi_masks[roi_name][z_slice] = next_mask.copy()
 
+        self._mark_roi_edited()
         self.update_display()
         self.recompute_preview_for_current_roi()
+        self.redo_performed.emit()
 
     def _fast_draw_at_position(self, row: int, col: int):
         if row is None or col is None or self.temp_mask is None:
@@ -2899,16 +3147,18 @@ class SimpleNiftiContouringApp(QMainWindow):
         # ブラシモード（Shift押下含む）: brush_size
         # 消しゴムモードボタン選択時: eraser_size
         current_size = self.brush_size if self.operation_mode == "brush" else self.eraser_size
-        kernel_coords = self.brush_kernels.get(current_size, np.array([[0, 0]], dtype=np.int32))
-        pts = kernel_coords + np.array([r, c], dtype=np.int32)
-        valid = (pts[:, 0] >= 0) & (pts[:, 0] < h) & (pts[:, 1] >= 0) & (pts[:, 1] < w)
-        pts = pts[valid]
-        if pts.size == 0:
-            return
-        if self.current_tool_mode == "brush":
-            self.temp_mask[pts[:, 0], pts[:, 1]] = True
-        else:
-            self.temp_mask[pts[:, 0], pts[:, 1]] = False
+        kernel = self.brush_kernels.get(current_size)
+        if kernel is None:
+            kernel = (np.zeros(1, dtype=np.int16), np.zeros(1, dtype=np.int16))
+        rows = kernel[0] + np.int32(r)
+        cols = kernel[1] + np.int32(c)
+        valid = (rows >= 0) & (rows < h) & (cols >= 0) & (cols < w)
+        if not valid.all():
+            rows = rows[valid]
+            cols = cols[valid]
+            if rows.size == 0:
+                return
+        self.temp_mask[rows, cols] = (self.current_tool_mode == "brush")
 
     def _fast_draw_line(self, start_pos: Tuple[int, int], end_pos: Tuple[int, int]):
         if start_pos is None or end_pos is None:
@@ -2939,6 +3189,7 @@ class SimpleNiftiContouringApp(QMainWindow):
                 del self.roi_masks[self.current_roi_name][z]
         else:
             self.roi_masks[self.current_roi_name][z] = cleaned.copy()
+        self._mark_roi_edited(self.current_roi_name)
 
     def _commit_temp_mask(self):
         """互換性のため残す（古い処理で使われている可能性がある）"""
@@ -2964,6 +3215,7 @@ class SimpleNiftiContouringApp(QMainWindow):
                 return
             if old_name in self.roi_masks:
                 self.roi_masks[new_name] = self.roi_masks.pop(old_name)
+                self._mark_roi_edited()
             if old_name in self.roi_color_map:
                 self.roi_color_map[new_name] = self.roi_color_map.pop(old_name)
             if hasattr(self, "roi_visibility"):
@@ -3009,6 +3261,7 @@ class SimpleNiftiContouringApp(QMainWindow):
                 if reply == QMessageBox.Yes:
                     if self.current_roi_name in self.roi_masks:
                         del self.roi_masks[self.current_roi_name]
+                        self._mark_roi_edited()
                     if self.current_roi_name in self.roi_color_map:
                         del self.roi_color_map[self.current_roi_name]
                     if hasattr(self, "roi_visibility") and self.current_roi_name in self.roi_visibility:
@@ -3054,6 +3307,7 @@ class SimpleNiftiContouringApp(QMainWindow):
 
         # ROIを削除
         del self.roi_masks[roi_name][z]
+        self._mark_roi_edited(roi_name)
 
         # 描画中の一時データもクリア
         self.temp_mask = None
@@ -3077,6 +3331,7 @@ class SimpleNiftiContouringApp(QMainWindow):
         self.update_display()
         # ROI変更時にプレビューを再計算
         self.schedule_preview_recompute(immediate=True)
+        self.roi_selected.emit(roi_name)
 
     def update_roi_list(self):
         """ROIリスト更新（行ウィジェットで表示。アイテムtextは空にして二重表示を回避）"""
@@ -3142,10 +3397,13 @@ class SimpleNiftiContouringApp(QMainWindow):
 
         self.roi_listbox.blockSignals(False)
 
-    def set_window(self, wl, ww):
+    def set_window(self, wl, ww, deferred: bool = False):
         self.window_level = float(wl)
         self.window_width = float(max(1.0, ww))
-        self.update_display()
+        if deferred:
+            self.request_display_update()
+        else:
+            self.update_display()
         self.update_ww_wl_label()
 
     # --- 補間（確定/プレビュー）関係：既存実装を維持 ---
@@ -3185,6 +3443,7 @@ class SimpleNiftiContouringApp(QMainWindow):
                 # まとめて1ステップとしてUndoに積む
                 self.undo_stack.append({"group": True, "changes": grouped_changes})
                 self._interpolate_executed = True
+                self.interpolation_done.emit()
                 QMessageBox.information(
                     self, "成功",
                     f"ROI '{self.current_roi_name}' で {total_count} スライスを補間しました"
@@ -3194,6 +3453,7 @@ class SimpleNiftiContouringApp(QMainWindow):
                 cfg = getattr(self, "game_config", None)
                 if cfg and cfg.tutorial_mode:
                     self._interpolate_executed = True
+                    self.interpolation_done.emit()
                 QMessageBox.information(self, "情報", "補間するスライスがありませんでした")
 
             self.update_display()
@@ -3251,6 +3511,8 @@ class SimpleNiftiContouringApp(QMainWindow):
                     changes.append((slice_idx, prev_mask))
                     del roi_data[slice_idx]
 
+        if changes:
+            self._mark_roi_edited(self.current_roi_name)
         return interpolated_count, changes
 
     def _compute_signed_distance_transform(self, mask: np.ndarray) -> np.ndarray:
@@ -3463,6 +3725,7 @@ class SimpleNiftiContouringApp(QMainWindow):
                 return
 
             self.roi_masks = {}
+            self._mark_roi_edited()
             self.roi_color_map = {}
             # パレット（fallback用）
             palette = getattr(self, "roi_colors", ["#e6194b"])
@@ -3569,6 +3832,7 @@ class SimpleNiftiContouringApp(QMainWindow):
 
         palette = getattr(self, "roi_colors", ["#e6194b"])
         h, w, d = label_vol.shape
+        self._mark_roi_edited()
 
         for lab in sorted(labels):
             roi_name = meta_map.get(lab, {}).get("name", f"ROI_{lab}")
@@ -3772,6 +4036,7 @@ class SimpleNiftiContouringApp(QMainWindow):
         # 変更があった時だけグループでUndoに積む
         if applied > 0 and changes:
             self.undo_stack.append({"group": True, "changes": changes})
+            self._mark_roi_edited(roi_name)
 
         # プレビューはクリアして表示更新
         self.preview_masks.clear()
@@ -3779,6 +4044,7 @@ class SimpleNiftiContouringApp(QMainWindow):
 
         if applied > 0:
             self._interpolate_executed = True
+            self.interpolation_done.emit()
             QMessageBox.information(self, "成功", f"プレビューから {applied} スライスを確定しました。")
         else:
             QMessageBox.information(self, "情報", "上書きすべきスライスがありませんでした（既に確定済みか空）。")
@@ -3814,6 +4080,7 @@ class SimpleNiftiContouringApp(QMainWindow):
                         continue
 
                     self.roi_masks[roi_name][z] = pmask.copy()
+                    self._mark_roi_edited(roi_name)
                     total_applied += 1
 
         # 元のROIに戻す
@@ -3836,7 +4103,6 @@ class SimpleNiftiContouringApp(QMainWindow):
 
     def choose_roi_color(self, roi_name: str):
         from PySide6.QtWidgets import QColorDialog
-        from PySide6.QtGui import QColor
         current = self.roi_color_map.get(roi_name, "red")
         qc = QColor(current)
         if not qc.isValid():
@@ -3905,6 +4171,7 @@ class SimpleNiftiContouringApp(QMainWindow):
 
         # 上書きで確定
         self.roi_masks[roi_name][z] = pmask.copy()
+        self._mark_roi_edited(roi_name)
 
         # このスライスのプレビューは消す
         if z in self.preview_masks:
@@ -3956,6 +4223,7 @@ class SimpleNiftiContouringApp(QMainWindow):
                 m = zdict[z]
                 if m is not None:
                     zdict[z] = m[::-1, :]
+        self._mark_roi_edited()
 
         # プレビュー（z→2Dマスクを左右反転）
         for z in list(self.preview_masks.keys()):
@@ -3985,6 +4253,7 @@ class SimpleNiftiContouringApp(QMainWindow):
                 m = zdict[z]
                 if m is not None:
                     zdict[z] = m[:, ::-1]
+        self._mark_roi_edited()
 
         # プレビュー（z→2Dマスクを前後反転）
         for z in list(self.preview_masks.keys()):
@@ -4016,6 +4285,7 @@ class SimpleNiftiContouringApp(QMainWindow):
                 new_z = self.max_axial - z
                 new_masks[roi_name][new_z] = m.copy() if m is not None else None
         self.roi_masks = new_masks
+        self._mark_roi_edited()
 
         # プレビュー（zキーを入れ替え）
         new_prev = {}
@@ -4070,6 +4340,7 @@ class SimpleNiftiContouringApp(QMainWindow):
         self.update_slice_labels()
         self.update_zoom_label()
         self._view_reset = True
+        self.view_changed.emit()
 
     def apply_game_config(self, cfg: 'GameConfig'):
         """ゲーム設定適用（ROI固定・改名/追加/削除封印、ショートカット遮断）"""
@@ -4081,10 +4352,9 @@ class SimpleNiftiContouringApp(QMainWindow):
 
         # ROI固定（指定があれば差し替え）※チュートリアルモードでは固定しない
         if cfg.enabled and cfg.roi_names and not cfg.tutorial_mode:
-            from app.common.styles import roi_color
-
             # コンポーネント初期化
             self.roi_masks = {}
+            self._mark_roi_edited()
             self.roi_color_map = {}
             self.roi_visibility = {}
 
@@ -4904,27 +5174,49 @@ class SimpleNiftiContouringApp(QMainWindow):
 
 
 # ------- 輪郭抽出・点線生成（ユーティリティ） -------
-def _binary_erode_once_8n(a: np.ndarray) -> np.ndarray:
-    p = a.astype(bool)
+def _and_neighbors_wrap(p: np.ndarray, axis: int) -> np.ndarray:
+    """p と axis 方向の前後1画素との AND（端は np.roll と同じく反対側に回り込む）"""
     e = p.copy()
-    for dy in (-1, 0, 1):
-        for dx in (-1, 0, 1):
-            if dy == 0 and dx == 0:
-                continue
-            e &= np.roll(np.roll(p, dy, axis=0), dx, axis=1)
+    a = np.moveaxis(p, axis, 0)
+    b = np.moveaxis(e, axis, 0)
+    b[1:] &= a[:-1]
+    b[:-1] &= a[1:]
+    b[0] &= a[-1]
+    b[-1] &= a[0]
     return e
 
-def _border_from_mask(m: np.ndarray, thickness: int = 2) -> np.ndarray:
-    m = m.astype(bool)
-    inner = m.copy()
-    for _ in range(max(1, int(thickness))):
+def _binary_erode_once_8n(a: np.ndarray) -> np.ndarray:
+    # 3x3 の8近傍収縮は行方向→列方向の分離可能な AND で済む（ロールのコピーを作らない）
+    p = a.astype(bool, copy=False)
+    return _and_neighbors_wrap(_and_neighbors_wrap(p, 1), 0)
+
+def _border_full(m: np.ndarray, thickness: int) -> np.ndarray:
+    inner = m
+    for _ in range(thickness):
         inner = _binary_erode_once_8n(inner)
-    border = m & (~inner)
+    return m & (~inner)
+
+def _border_from_mask(m: np.ndarray, thickness: int = 2) -> np.ndarray:
+    m = m.astype(bool, copy=False)
+    t = max(1, int(thickness))
+    rows = np.flatnonzero(m.any(axis=1))
+    if rows.size == 0:
+        return np.zeros(m.shape, dtype=bool)
+    cols = np.flatnonzero(m.any(axis=0))
+    # ROI の外接矩形＋余白だけを収縮すれば、処理量は画像全体ではなく ROI の大きさに比例する。
+    # 余白が画像端にかかる場合は、端の回り込みを含めて元と同じ結果にするため全体で計算する
+    h, w = m.shape
+    y0, y1 = rows[0] - t - 1, rows[-1] + t + 2
+    x0, x1 = cols[0] - t - 1, cols[-1] + t + 2
+    if y0 < 0 or x0 < 0 or y1 > h or x1 > w:
+        return _border_full(m, t)
+    border = np.zeros(m.shape, dtype=bool)
+    border[y0:y1, x0:x1] = _border_full(m[y0:y1, x0:x1], t)
     return border
 
 def create_outline_qimage(mask: np.ndarray, color_rgba, thickness: int = 2) -> QImage:
     border = _border_from_mask(mask, thickness=max(1, int(thickness)))
-    return create_colored_mask_qimage(border.astype(mask.dtype), color_rgba)
+    return create_colored_mask_qimage(border, color_rgba)
 
 def create_dotted_outline_qimage(mask: np.ndarray, color_rgba,
                                  dot_radius: int = 1, spacing: int = 2,
@@ -4932,7 +5224,7 @@ def create_dotted_outline_qimage(mask: np.ndarray, color_rgba,
     border = _border_from_mask(mask, thickness=max(1, int(border_thickness)))
     h, w = border.shape
     if not np.any(border):
-        return create_colored_mask_qimage(np.zeros_like(border, dtype=np.uint8), [0, 0, 0, 0])
+        return create_colored_mask_qimage(border, [0, 0, 0, 0])
     yy, xx = np.where(border)
     cy, cx = yy.mean(), xx.mean()
     angles = np.arctan2(yy - cy, xx - cx)
@@ -4961,7 +5253,7 @@ def create_dotted_outline_qimage(mask: np.ndarray, color_rgba,
                 cx0 = R - (x - xs.start)
                 circle_crop = circle[cy0:cy0+sub.shape[0], cx0:cx0+sub.shape[1]]
                 dots[ys, xs] = sub | circle_crop
-    return create_colored_mask_qimage(dots.astype(np.uint8), color_rgba)
+    return create_colored_mask_qimage(dots, color_rgba)
 
 
 # -------------------- main --------------------
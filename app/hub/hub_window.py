@@ -22,13 +22,18 @@ from app.common.styles import (
     PRIMARY_ACCENT, BG_GRADIENT, BASE_STYLESHEET, accent_from_text, hex_to_rgb, shade, btn_style,
 )
 from app.common.widgets import GameCard, FunButton
-from app.common.csv_utils import year_csv_path
+from app.common.csv_utils import year_csv_path, write_year_csv
 
 from .settings_dialog import SettingsDialog
 
 
 APP_TITLE = "Contour Quest"
 
+_REGION_BTN_STYLE = (
+    btn_style(outline=True)
+    + f" QPushButton:checked{{background:{PRIMARY_ACCENT}; color:white; border:none;}}"
+)
+
 
 class HubWindow(QMainWindow):
     """カード型グリッドのハブ画面"""
@@ -333,12 +338,8 @@ class HubWindow(QMainWindow):
                 return
 
             for name in names:
-                b = FunButton(name, outline=True)
+                b = FunButton(name, outline=True, style=_REGION_BTN_STYLE)
                 b.setCheckable(True)
-                b.setStyleSheet(
-                    btn_style(outline=True)
-                    + f" QPushButton:checked{{background:{PRIMARY_ACCENT}; color:white; border:none;}}"
-                )
                 b.clicked.connect(lambda _=False, n=name: self._select_region(n))
                 self.region_buttons_layout.addWidget(b)
                 self._region_btns[name] = b
@@ -573,13 +574,19 @@ class HubWindow(QMainWindow):
                 self._last_play_year = year
                 self._last_play_session = session_full
                 ts = _dt.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                self._write_year_csv(year, {
-                    "timestamp": ts, "year": year, "group": group, "team": team,
-                    "participant": participant, "session": session_full, "region": region,
-                    "mode": mode, "rois": rois, "ct": make_relative_path(ct),
-                    "gt_label": make_relative_path(gt_label),
-                    "result_dir": make_relative_path(group_outdir),
-                })
+                try:
+                    write_year_csv(year, {
+                        "timestamp": ts, "year": year, "group": group, "team": team,
+                        "participant": participant, "session": session_full, "region": region,
+                        "mode": mode, "rois": rois, "ct": make_relative_path(ct),
+                        "gt_label": make_relative_path(gt_label),
+                        "result_dir": make_relative_path(group_outdir),
+                    })
+                except Exception as e:
+                    try:
+                        QMessageBox.warning(self, "CSV保存エラー", f"年度CSVへの保存に失敗しました。\n{e}")
+                    except Exception:
+                        pass
 
             roi_list = [s.strip() for s in rois.split(",")] if rois and mode != "practice" else None
 
@@ -696,32 +703,6 @@ class HubWindow(QMainWindow):
         except Exception as e:
             print(f"スコアリング起動失敗: {e}")
 
-    def _write_year_csv(self, year: str, row: dict):
-        try:
-            path = year_csv_path(year)
-            fieldnames = [
-                "timestamp", "year", "group", "team", "participant",
-                "session", "region", "mode", "rois", "ct", "gt_label", "result_dir",
-            ]
-            exists_and_nonempty = os.path.exists(path) and os.path.getsize(path) > 0
-
-            with open(path, "a", newline="", encoding="utf-8-sig") as f:
-                writer = _csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
-                if not exists_and_nonempty:
-                    writer.writeheader()
-
-                sanitized = {}
-                for k in fieldnames:
-                    val = row.get(k, "")
-                    sanitized[k] = "" if val is None else str(val)
-                writer.writerow(sanitized)
-
-        except Exception as e:
-            try:
-                QMessageBox.warning(self, "CSV保存エラー", f"年度CSVへの保存に失敗しました。\n{e}")
-            except Exception:
-                pass
-
     def _remove_year_csv_row(self, year: str, session: str):
         """年度CSVから指定セッションの行を除外して書き戻す。"""
         try:
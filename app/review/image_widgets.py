@@ -10,6 +10,8 @@ from PySide6.QtWidgets import QLabel, QFrame, QSizePolicy
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QPixmap, QPainter, QColor, QImage, QTransform
 
+from app.common.qimage_utils import create_colored_mask_qimage
+
 
 # -------------------- マスク・輪郭ユーティリティ --------------------
 
@@ -29,19 +31,7 @@ def create_colored_outline_qimage(mask: np.ndarray, color_rgba, thickness: int =
     border = _border_from_mask(mask, thickness=thickness)
     rgba = np.zeros((h, w, 4), dtype=np.uint8)
     rgba[border > 0] = color_rgba
-    rgba_flat = np.ascontiguousarray(rgba)
-    qimg = QImage(rgba_flat.data, w, h, w * 4, QImage.Format_RGBA8888)
-    qimg.ndarray = rgba_flat
-    return qimg
-
-
-def create_colored_mask_qimage(mask: np.ndarray, color_rgba) -> QImage:
-    """マスクの色付きQImageを作成"""
-    h, w = mask.shape
-    mask_u8 = mask.astype(np.uint8)
-    rgba = np.zeros((h, w, 4), dtype=np.uint8)
-    rgba[mask_u8 > 0] = color_rgba
-    rgba_flat = np.ascontiguousarray(rgba)
+    rgba_flat = rgba  # np.zeros で確保済みなので C 連続
     qimg = QImage(rgba_flat.data, w, h, w * 4, QImage.Format_RGBA8888)
     qimg.ndarray = rgba_flat
     return qimg
@@ -351,7 +341,7 @@ class ImageDisplayWidget(QLabel):
             rgb_image[:, :, 2] = ct_normalized
 
         # QImage → QPixmap
-        rgb_flat = np.ascontiguousarray(rgb_image)
+        rgb_flat = rgb_image  # np.zeros で確保済みなので C 連続
         qimg = QImage(rgb_flat.data, w, h, w * 3, QImage.Format_RGB888)
         qimg.ndarray = rgb_flat
         pixmap = QPixmap.fromImage(qimg)
@@ -424,7 +414,7 @@ class ImageDisplayWidget(QLabel):
                         y_coords, x_coords = np.where(border)
                         rgba_image[y_coords, x_coords] = roi_rgba
 
-            rgba_flat = np.ascontiguousarray(rgba_image)
+            rgba_flat = rgba_image  # np.zeros で確保済みなので C 連続
             qimg = QImage(rgba_flat.data, w, h, w * 4, QImage.Format_RGBA8888)
             qimg.ndarray = rgba_flat
             pixmap = QPixmap.fromImage(qimg)